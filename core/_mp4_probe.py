@@ -0,0 +1,102 @@
+"""
+Lecture du codec audio d'un conteneur MP4 sans lancer ffprobe.
+
+Parcourt les boîtes ISO-BMFF (moov → trak → mdia → hdlr/minf/stbl/stsd)
+directement en Python : quelques lectures de quelques octets suffisent là où
+ffprobe sonde le fichier entier, avec en prime le coût de lancement d'un
+processus à chaque vérification.
+"""
+
+import struct
+
+
+def _boxes(f, start, end):
+    """
+    Itère les boîtes comprises entre les offsets start et end sous forme
+    de triplets (type, début du contenu, fin de la boîte)
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        payload = pos + 8
+        if size == 1:
+            # Taille 64 bits dans les 8 octets qui suivent l'en-tête
+            big = f.read(8)
+            if len(big) < 8:
+                return
+            size = struct.unpack('>Q', big)[0]
+            payload = pos + 16
+        elif size == 0:
+            # La boîte court jusqu'à la fin du parent
+            size = end - pos
+        if size < 8 or pos + size > end:
+            return
+        yield box_type, payload, pos + size
+        pos += size
+
+
+def _first_box(f, start, end, wanted):
+    """Retourne (début du contenu, fin) de la première boîte `wanted`"""
+    for box_type, payload, box_end in _boxes(f, start, end):
+        if box_type == wanted:
+            return payload, box_end
+    return None
+
+
+def _trak_audio_codec(f, start, end):
+    """Retourne le fourcc de la première entrée stsd si la piste est audio"""
+    mdia = _first_box(f, start, end, b'mdia')
+    if mdia is None:
+        return None
+
+    # hdlr : version/flags (4) + pre_defined (4) + handler_type (4)
+    hdlr = _first_box(f, mdia[0], mdia[1], b'hdlr')
+    if hdlr is None:
+        return None
+    f.seek(hdlr[0] + 8)
+    if f.read(4) != b'soun':
+        return None
+
+    minf = _first_box(f, mdia[0], mdia[1], b'minf')
+    if minf is None:
+        return None
+    stbl = _first_box(f, minf[0], minf[1], b'stbl')
+    if stbl is None:
+        return None
+    stsd = _first_box(f, stbl[0], stbl[1], b'stsd')
+    if stsd is None:
+        return None
+
+    # stsd : version/flags (4) + entry_count (4), puis la première entrée
+    # dont l'en-tête est size (4) + format (4)
+    f.seek(stsd[0] + 8)
+    entry_header = f.read(8)
+    if len(entry_header) < 8:
+        return None
+    return entry_header[4:8].decode('ascii', 'replace').strip()
+
+
+def read_audio_codec(path):
+    """
+    Retourne le codec audio d'un fichier MP4/M4A ('aac' pour mp4a, sinon
+    le fourcc brut), ou None si le conteneur n'est pas lisible
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, 2)
+            file_end = f.tell()
+            moov = _first_box(f, 0, file_end, b'moov')
+            if moov is None:
+                return None
+            for box_type, payload, box_end in _boxes(f, moov[0], moov[1]):
+                if box_type == b'trak':
+                    codec = _trak_audio_codec(f, payload, box_end)
+                    if codec:
+                        return 'aac' if codec == 'mp4a' else codec
+    except (OSError, struct.error):
+        return None
+    return None
@@ -1,465 +1,762 @@
-import os
-import sys
-import subprocess
-from pathlib import Path
-from PyQt6.QtCore import QThread, pyqtSignal, QObject
-import yt_dlp
-#from utils import format_time, sanitize_filename, get_available_formats
-from core.utils import format_time, sanitize_filename, get_available_formats
-from ffmpeg import get_fmpeg_path
-
-
-class DownloadWorker(QThread):
-    """Worker thread pour le téléchargement et la conversion"""
-    
-    # Signaux pour communiquer avec l'interface
-    progress = pyqtSignal(int)  # Progression en pourcentage
-    status = pyqtSignal(str)    # Statut actuel
-    finished = pyqtSignal(bool, str)  # Succès/échec et message
-    info_extracted = pyqtSignal(dict)  # Informations de la vidéo
-    error_occurred = pyqtSignal(str) #signal d'erreur
-    
-    def __init__(self, url, format_type, quality, output_path, cookies_file=None):
-        super().__init__()
-        self.url = url
-        self.output_path = Path(output_path)
-        self.format_type = format_type
-        self.quality = quality
-        self.cookies_file = cookies_file
-        print(f" path : {self.output_path}")
-        self.is_cancelled = False
-        self.temp_file = None  # Nouveau : pour stocker le fichier temporaire
-        
-    def run(self):
-        """Méthode principale du thread"""
-        try:
-            self.status.emit("Extraction des informations...")
-            
-            # Configuration yt-dlp
-            ydl_opts = self._get_ydl_options()
-            print("Options yt-dlp :", ydl_opts)
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extraction des informations
-                info = ydl.extract_info(self.url, download=False)
-                self.info_extracted.emit({
-                    'title': info.get('title', 'Inconnu'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Inconnu'),
-                    'view_count': info.get('view_count', 0)
-                })
-                
-                if self.is_cancelled:
-                    return
-                
-                # Téléchargement
-                self.status.emit("Téléchargement en cours...")
-                ydl.download([self.url])
-                
-                # NOUVEAU : Conversion audio pour les vidéos
-                if self.format_type in ['mp4', 'video'] and self.temp_file:
-                    self.status.emit("Vérification et conversion audio...")
-                    self._ensure_aac_audio()
-                
-            self.finished.emit(True, "Téléchargement terminé avec succès!")
-            
-        except Exception as e:
-            error_msg = f"Erreur: {str(e)}"
-            self.error_occurred.emit(error_msg)
-            self.finished.emit(False, error_msg)
-    
-    def _get_ydl_options(self):
-        """Configure les options pour yt-dlp"""
-        
-        def progress_hook(d):
-            if self.is_cancelled:
-                raise yt_dlp.DownloadError("Téléchargement annulé")
-                
-            if d['status'] == 'downloading':
-                if 'total_bytes' in d:
-                    percent = int(d['downloaded_bytes'] / d['total_bytes'] * 100)
-                    self.progress.emit(percent)
-                elif '_percent_str' in d:
-                    # Extraction du pourcentage depuis la chaîne
-                    percent_str = d['_percent_str'].strip().replace('%', '')
-                    try:
-                        percent = int(float(percent_str))
-                        self.progress.emit(percent)
-                    except ValueError:
-                        pass
-            elif d['status'] == 'finished':
-                self.progress.emit(100)
-                # NOUVEAU : Stocker le fichier temporaire pour les vidéos
-                if self.format_type in ['mp4', 'video']:
-                    self.temp_file = d['filename']
-                self.status.emit("Téléchargement terminé, finalisation...")
-        
-        # Template de nom de fichier - MODIFIÉ
-        if self.format_type in ['mp4', 'video']:
-            filename_template = '%(title)s_temp.%(ext)s'
-        else:
-            filename_template = '%(title)s.%(ext)s'
-        
-        # Options de base
-        ydl_opts = {
-            'outtmpl': str(self.output_path / filename_template),
-            'progress_hooks': [progress_hook],
-        }
-        
-        print(f"format type : {self.format_type}")
-        
-        # Configuration selon le format souhaité
-        if self.format_type == 'mp3' or self.format_type == 'audio':
-            ydl_opts.update({
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-            })
-        elif self.format_type == 'mp4' or self.format_type == 'video':
-            # NOUVEAU : Format optimisé pour éviter l'Opus
-            ydl_opts.update({
-                'format': (
-                    'bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[acodec=aac]/'
-                    'bestvideo[ext=mp4]+bestaudio[acodec=aac]/'
-                    'bestvideo[ext=mp4]+140/'  # Format 140 = AAC
-                    'best[ext=mp4]'
-                ),
-                'merge_output_format': 'mp4',
-                # Pas de post-processeur ici, on le fera manuellement
-            })
-        
-        if self.cookies_file:
-            ydl_opts['cookiefile'] = self.cookies_file
-        
-        return ydl_opts
-    
-    def _ensure_aac_audio(self):
-        """NOUVELLE MÉTHODE : S'assure que l'audio est en AAC"""
-        if not self.temp_file or not Path(self.temp_file).exists():
-            return
-        
-        try:
-            # Vérifier le codec audio
-            audio_codec = self._get_audio_codec(self.temp_file)
-            print(f"Codec audio détecté: {audio_codec}")
-            
-            # Nom du fichier final
-            final_file = self.temp_file.replace('_temp.mp4', '.mp4')
-            
-            if audio_codec != 'aac':
-                self.status.emit("Conversion audio vers AAC...")
-                print("Conversion audio nécessaire...")
-                self._convert_to_aac(self.temp_file, final_file)
-            else:
-                print("Audio déjà en AAC, simple renommage...")
-                Path(self.temp_file).rename(final_file)
-                
-        except Exception as e:
-            print(f"Erreur lors de la conversion audio: {e}")
-            # En cas d'erreur, renommer le fichier temporaire
-            final_file = self.temp_file.replace('_temp.mp4', '_original.mp4')
-            if Path(self.temp_file).exists():
-                Path(self.temp_file).rename(final_file)
-    
-    def _get_audio_codec(self, file_path):
-        """NOUVELLE MÉTHODE : Détecte le codec audio d'un fichier"""
-        try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-select_streams', 'a:0',
-                '-show_entries', 'stream=codec_name', '-of', 'csv=p=0',
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except:
-            return 'unknown'
-    
-    def _convert_to_aac(self, input_file, output_file):
-        """NOUVELLE MÉTHODE : Convertit l'audio en AAC"""
-        cmd = [
-            get_fmpeg_path(), '-y', '-i', input_file,
-            '-c:v', 'copy',           # Copie la vidéo sans réencodage
-            '-c:a', 'aac',            # Force l'audio en AAC
-            '-b:a', '192k',           # Bitrate audio
-            '-ac', '2',               # Stéréo
-            '-ar', '44100',           # Fréquence d'échantillonnage
-            '-movflags', '+faststart', # Optimisation pour la lecture
-            output_file
-        ]
-        
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print("Conversion audio réussie !")
-            
-            # Supprimer le fichier temporaire
-            if Path(input_file).exists():
-                Path(input_file).unlink()
-                
-        except subprocess.CalledProcessError as e:
-            print(f"Erreur lors de la conversion: {e}")
-            # En cas d'erreur, renommer le fichier original
-            if Path(input_file).exists():
-                Path(input_file).rename(output_file)
-    
-    def _get_audio_quality(self):
-        """Convertit la qualité en paramètre pour FFmpeg"""
-        quality_map = {
-            'best': '0',      # VBR haute qualité
-            'high': '2',      # ~190 kbps
-            'medium': '4',    # ~165 kbps
-            'low': '7',       # ~100 kbps
-        }
-        return quality_map.get(self.quality, '0')
-    
-    def cancel(self):
-        """Annule le téléchargement"""
-        self.is_cancelled = True
-
-
-class MediaConverter:
-    """Classe pour les conversions de médias avec FFmpeg"""
-    
-    @staticmethod
-    def is_ffmpeg_available():
-        """Vérifie si FFmpeg est disponible"""
-        try:
-            subprocess.run([get_fmpeg_path(), '-version'], 
-                         capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
-    
-    @staticmethod
-    def convert_audio(input_path, output_path, target_format, quality='medium'):
-        """Convertit un fichier audio"""
-        input_path = Path(input_path)
-        output_path = Path(output_path)
-        
-        if not input_path.exists():
-            raise FileNotFoundError(f"Fichier source introuvable: {input_path}")
-        
-        # Commande FFmpeg de base
-        cmd = [get_fmpeg_path(), '-i', str(input_path), '-y']  # -y pour écraser
-        
-        # Configuration selon le format cible
-        if target_format.lower() == 'mp3':
-            quality_map = {
-                'low': '128k',
-                'medium': '192k',
-                'high': '320k'
-            }
-            bitrate = quality_map.get(quality, '192k')
-            cmd.extend(['-codec:a', 'libmp3lame', '-b:a', bitrate])
-        
-        elif target_format.lower() == 'wav':
-            cmd.extend(['-codec:a', 'pcm_s16le'])
-        
-        elif target_format.lower() == 'aac':
-            quality_map = {
-                'low': '96k',
-                'medium': '128k',
-                'high': '256k'
-            }
-            bitrate = quality_map.get(quality, '128k')
-            cmd.extend(['-codec:a', 'aac', '-b:a', bitrate])
-        
-        cmd.append(str(output_path))
-        
-        # Exécution de la conversion
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return True, "Conversion réussie"
-        except subprocess.CalledProcessError as e:
-            return False, f"Erreur FFmpeg: {e.stderr}"
-    
-    @staticmethod
-    def ensure_aac_audio(input_path, output_path=None):
-        """NOUVELLE MÉTHODE : S'assure que le fichier a un audio AAC compatible"""
-        input_path = Path(input_path)
-        if output_path is None:
-            output_path = input_path.parent / f"{input_path.stem}_aac{input_path.suffix}"
-        
-        if not input_path.exists():
-            raise FileNotFoundError(f"Fichier source introuvable: {input_path}")
-        
-        cmd = [
-            get_fmpeg_path(), '-y', '-i', str(input_path),
-            '-c:v', 'copy',           # Copie la vidéo
-            '-c:a', 'aac',            # Force AAC
-            '-b:a', '192k',           # Bitrate
-            '-ac', '2',               # Stéréo
-            '-ar', '44100',           # Fréquence
-            '-movflags', '+faststart', # Optimisation
-            str(output_path)
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return True, f"Conversion réussie: {output_path}"
-        except subprocess.CalledProcessError as e:
-            return False, f"Erreur FFmpeg: {e.stderr}"
-    
-    @staticmethod
-    def check_audio_codec(file_path):
-        """NOUVELLE MÉTHODE : Vérifie le codec audio d'un fichier"""
-        try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-select_streams', 'a:0',
-                '-show_entries', 'stream=codec_name', '-of', 'csv=p=0',
-                str(file_path)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            codec = result.stdout.strip()
-            return codec
-        except:
-            return 'unknown'
-    
-    @staticmethod
-    def get_media_info(file_path):
-        """Récupère les informations d'un fichier média"""
-        try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-print_format', 'json',
-                '-show_format', '-show_streams', str(file_path)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            import json
-            data = json.loads(result.stdout)
-            
-            # Extraction des informations principales
-            format_info = data.get('format', {})
-            streams = data.get('streams', [])
-            
-            info = {
-                'duration': float(format_info.get('duration', 0)),
-                'size': int(format_info.get('size', 0)),
-                'bitrate': int(format_info.get('bit_rate', 0)),
-                'format': format_info.get('format_name', 'Unknown'),
-            }
-            
-            # Informations audio/vidéo
-            for stream in streams:
-                if stream.get('codec_type') == 'audio':
-                    info.update({
-                        'audio_codec': stream.get('codec_name', 'Unknown'),
-                        'sample_rate': int(stream.get('sample_rate', 0)),
-                        'channels': int(stream.get('channels', 0)),
-                    })
-                elif stream.get('codec_type') == 'video':
-                    info.update({
-                        'video_codec': stream.get('codec_name', 'Unknown'),
-                        'width': int(stream.get('width', 0)),
-                        'height': int(stream.get('height', 0)),
-                        'fps': eval(stream.get('r_frame_rate', '0/1')),
-                    })
-            
-            return info
-            
-        except Exception as e:
-            return {'error': str(e)}
-
-
-class PlaylistDownloader(QThread):
-    """Worker pour télécharger des playlists"""
-    
-    progress = pyqtSignal(int, int)  # current, total
-    video_finished = pyqtSignal(str, bool)  # title, success
-    all_finished = pyqtSignal(bool, str)
-    
-    def __init__(self, url, output_path, format_type="mp3", quality="best"):
-        super().__init__()
-        self.url = url
-        self.output_path = Path(output_path)
-        self.format_type = format_type
-        self.quality = quality
-        self.is_cancelled = False
-    
-    def run(self):
-        """Télécharge une playlist complète"""
-        try:
-            # Configuration pour extraire les informations de la playlist
-            ydl_opts = {
-                'extract_flat': True,
-                'quiet': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                playlist_info = ydl.extract_info(self.url, download=False)
-                
-            if 'entries' not in playlist_info:
-                self.all_finished.emit(False, "Ce n'est pas une playlist valide")
-                return
-            
-            entries = playlist_info['entries']
-            total_videos = len(entries)
-            
-            # Téléchargement de chaque vidéo
-            for i, entry in enumerate(entries):
-                if self.is_cancelled:
-                    break
-                
-                video_url = entry.get('url') or f"https://youtube.com/watch?v={entry['id']}"
-                video_title = entry.get('title', f'Vidéo {i+1}')
-                
-                # Créer un worker pour cette vidéo
-                worker = DownloadWorker(video_url, self.format_type, self.quality, self.output_path)
-                
-                success = self._download_single_video(worker)
-                self.video_finished.emit(video_title, success)
-                self.progress.emit(i + 1, total_videos)
-            
-            if not self.is_cancelled:
-                self.all_finished.emit(True, f"Playlist téléchargée: {total_videos} vidéos")
-            
-        except Exception as e:
-            self.all_finished.emit(False, f"Erreur playlist: {str(e)}")
-    
-    def _download_single_video(self, worker):
-        """Télécharge une seule vidéo de façon synchrone"""
-        try:
-            # Configuration yt-dlp
-            ydl_opts = worker._get_ydl_options()
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([worker.url])
-            
-            return True
-        except Exception:
-            return False
-    
-    def cancel(self):
-        """Annule le téléchargement de la playlist"""
-        self.is_cancelled = True
-
-
-# NOUVELLE FONCTION UTILITAIRE pour corriger les fichiers existants
-def fix_existing_mp4_audio(file_path):
-    """
-    Corrige l'audio d'un fichier MP4 existant
-    """
-    file_path = Path(file_path)
-    if not file_path.exists():
-        print(f"Fichier introuvable: {file_path}")
-        return False
-    
-    # Vérifier le codec audio
-    codec = MediaConverter.check_audio_codec(file_path)
-    print(f"Codec audio détecté: {codec}")
-    
-    if codec == 'aac':
-        print("Le fichier a déjà un audio AAC compatible")
-        return True
-    
-    # Créer le fichier corrigé
-    output_path = file_path.parent / f"{file_path.stem}_fixed.mp4"
-    success, message = MediaConverter.ensure_aac_audio(file_path, output_path)
-    
-    if success:
-        print(f"Fichier corrigé créé: {output_path}")
-        return True
-    else:
-        print(f"Échec de la correction: {message}")
+import functools
+import os
+import shutil
+import sys
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal, QObject
+import yt_dlp
+#from utils import format_time, sanitize_filename, get_available_formats
+from core.utils import format_time, sanitize_filename, get_available_formats
+from ffmpeg import get_fmpeg_path
+
+# Chemin ffmpeg résolu une seule fois à l'import : la découverte du
+# binaire n'a pas à être refaite à chaque conversion
+_FFMPEG = get_fmpeg_path()
+
+# aria2c télécharge chaque fichier sur plusieurs connexions TCP et sort la
+# copie d'octets de la boucle Python ; utilisé seulement s'il est installé
+_ARIA2C = shutil.which('aria2c')
+
+
+def _parse_frame_rate(rate):
+    """Convertit un 'r_frame_rate' ffprobe ('30000/1001') en float"""
+    num, _, den = rate.partition('/')
+    try:
+        num = int(num)
+        den = int(den) if den else 1
+    except ValueError:
+        return 0.0
+    return num / den if den else 0.0
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_media_info(path, size, mtime):
+    """Analyse complète d'un fichier média via un seul appel ffprobe JSON.
+
+    Mémoïsé sur (chemin, taille, mtime) : tant que le fichier n'a pas
+    changé, les appels répétés ne relancent pas de processus ffprobe.
+    Point d'entrée unique : codec audio, codec vidéo et infos conteneur
+    sortent tous du même appel.
+    """
+    try:
+        cmd = [
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_format', '-show_streams', path
+        ]
+        # Seul stdout (le JSON) nous intéresse : pas de buffer stderr
+        result = subprocess.run(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, check=True)
+        import json
+        data = json.loads(result.stdout)
+
+        # Extraction des informations principales
+        format_info = data.get('format', {})
+        streams = data.get('streams', [])
+
+        info = {
+            'duration': float(format_info.get('duration', 0)),
+            'size': int(format_info.get('size', 0)),
+            'bitrate': int(format_info.get('bit_rate', 0)),
+            'format': format_info.get('format_name', 'Unknown'),
+        }
+
+        # Informations audio/vidéo
+        for stream in streams:
+            if stream.get('codec_type') == 'audio':
+                info.update({
+                    'audio_codec': stream.get('codec_name', 'Unknown'),
+                    'sample_rate': int(stream.get('sample_rate', 0)),
+                    'channels': int(stream.get('channels', 0)),
+                })
+            elif stream.get('codec_type') == 'video':
+                info.update({
+                    'video_codec': stream.get('codec_name', 'Unknown'),
+                    'width': int(stream.get('width', 0)),
+                    'height': int(stream.get('height', 0)),
+                    'fps': _parse_frame_rate(stream.get('r_frame_rate', '0/1')),
+                })
+
+        return info
+
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _media_info_cached(file_path):
+    """Interroge le cache d'infos média en rafraîchissant la clé stat"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return {'error': 'Fichier introuvable'}
+    return dict(_probe_media_info(str(file_path), st.st_size, st.st_mtime))
+
+
+def _probe_codec_cached(file_path):
+    """Retourne le codec audio d'un fichier depuis les infos média en cache"""
+    codec = _media_info_cached(file_path).get('audio_codec')
+    return codec if codec else 'unknown'
+
+
+def _run_ffmpeg_streaming(cmd, progress_cb=None, total_duration=None, on_start=None):
+    """Exécute ffmpeg en lisant sa progression en continu.
+
+    Évite capture_output=True qui bufferise toute la sortie en mémoire :
+    la progression arrive ligne à ligne via '-progress pipe:1' et peut
+    être relayée à l'interface pendant les longues conversions.
+    `on_start` reçoit le Popen dès son lancement, ce qui permet à
+    l'appelant de le terminer en cas d'annulation.
+    """
+    # Les options de progression sont globales : insérées juste après le binaire
+    full_cmd = cmd[:1] + ['-progress', 'pipe:1', '-nostats'] + cmd[1:]
+
+    proc = subprocess.Popen(full_cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True, bufsize=1)
+    if on_start:
+        on_start(proc)
+    for line in proc.stdout:
+        if progress_cb and total_duration and line.startswith('out_time_ms='):
+            try:
+                # out_time_ms est exprimé en microsecondes
+                out_us = int(line.split('=', 1)[1])
+            except ValueError:
+                continue
+            progress_cb(min(100, int(out_us / (total_duration * 10000))))
+
+    return proc.wait()
+
+
+def _run_aac_convert(input_file, output_file, ffmpeg_path, on_start=None):
+    """Lance la conversion audio AAC (fonction de module, donc picklable)"""
+    cmd = [
+        ffmpeg_path, '-y',
+        '-fflags', '+fastseek',
+        '-i', input_file,
+        '-c:v', 'copy',           # Copie la vidéo sans réencodage
+        '-c:a', 'aac',            # Force l'audio en AAC
+        '-b:a', '192k',           # Bitrate audio
+        '-threads', '0',          # Laisse ffmpeg utiliser tous les cœurs
+        '-avoid_negative_ts', 'make_zero',
+    ]
+
+    # N'ajoute le rééchantillonnage que si la source diffère réellement :
+    # par défaut ffmpeg rééchantillonnerait inutilement un flux déjà conforme
+    media_info = _media_info_cached(input_file)
+    if media_info.get('channels') != 2:
+        cmd += ['-ac', '2']       # Stéréo
+    if media_info.get('sample_rate') != 44100:
+        cmd += ['-ar', '44100']   # Fréquence d'échantillonnage
+
+    cmd += [
+        '-movflags', '+faststart', # Optimisation pour la lecture
+        output_file
+    ]
+
+    returncode = _run_ffmpeg_streaming(cmd, on_start=on_start)
+    if returncode != 0:
+        print(f"Erreur lors de la conversion (code {returncode})")
+        return False
+    return True
+
+
+class DownloadWorker(QThread):
+    """Worker thread pour le téléchargement et la conversion"""
+    
+    # Signaux pour communiquer avec l'interface
+    progress = pyqtSignal(int)  # Progression en pourcentage
+    status = pyqtSignal(str)    # Statut actuel
+    finished = pyqtSignal(bool, str)  # Succès/échec et message
+    info_extracted = pyqtSignal(dict)  # Informations de la vidéo
+    error_occurred = pyqtSignal(str) #signal d'erreur
+    
+    def __init__(self, url, format_type, quality, output_path, cookies_file=None,
+                 info_dict=None):
+        super().__init__()
+        self.url = url
+        self.output_path = Path(output_path)
+        self.format_type = format_type
+        self.quality = quality
+        self.cookies_file = cookies_file
+        self.info_dict = info_dict  # Infos déjà extraites (évite un second extract_info)
+        print(f" path : {self.output_path}")
+        self.is_cancelled = False
+        self.temp_file = None  # Nouveau : pour stocker le fichier temporaire
+        self._downloaded_acodec = None  # Codec audio réellement téléchargé
+        self._last_pct = -1  # Dernier pourcentage émis (évite le spam de signaux)
+        self._proc = None  # Processus ffmpeg en cours, pour annulation immédiate
+        
+    def run(self):
+        """Méthode principale du thread"""
+        try:
+            self.status.emit("Extraction des informations...")
+            
+            # Configuration yt-dlp
+            ydl_opts = self._get_ydl_options()
+            print("Options yt-dlp :", ydl_opts)
+            
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # Extraction des informations (sauf si déjà fournies par l'appelant)
+                info = self.info_dict
+                if info is None:
+                    info = ydl.extract_info(self.url, download=False)
+                self.info_extracted.emit({
+                    'title': info.get('title', 'Inconnu'),
+                    'duration': info.get('duration', 0),
+                    'uploader': info.get('uploader', 'Inconnu'),
+                    'view_count': info.get('view_count', 0)
+                })
+
+                if self.is_cancelled:
+                    return
+
+                # Téléchargement : réutilise l'extraction déjà faite au lieu
+                # de laisser ydl.download refaire l'aller-retour réseau
+                self.status.emit("Téléchargement en cours...")
+                ydl.process_ie_result(dict(info), download=True)
+                
+                # NOUVEAU : Conversion audio pour les vidéos
+                if self.format_type in ['mp4', 'video'] and self.temp_file:
+                    if self._is_aac_codec(self._downloaded_acodec):
+                        # yt-dlp a déjà sélectionné un flux AAC : simple
+                        # renommage, aucun ffprobe ni ffmpeg nécessaire
+                        final_file = self.temp_file.replace('_temp.mp4', '.mp4')
+                        try:
+                            os.replace(self.temp_file, final_file)
+                        except FileNotFoundError:
+                            pass
+                    else:
+                        self.status.emit("Vérification et conversion audio...")
+                        self._ensure_aac_audio()
+                
+            self.finished.emit(True, "Téléchargement terminé avec succès!")
+            
+        except Exception as e:
+            error_msg = f"Erreur: {str(e)}"
+            self.error_occurred.emit(error_msg)
+            self.finished.emit(False, error_msg)
+    
+    def _get_ydl_options(self):
+        """Configure les options pour yt-dlp"""
+        
+        def progress_hook(d):
+            if self.is_cancelled:
+                raise yt_dlp.DownloadError("Téléchargement annulé")
+                
+            if d['status'] == 'downloading':
+                # Arithmétique entière sur les octets : pas de parsing de
+                # chaîne ni de float dans ce chemin appelé à chaque chunk
+                total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                if total:
+                    percent = d.get('downloaded_bytes', 0) * 100 // total
+                    # N'émet le signal Qt inter-threads que lorsque le
+                    # pourcentage entier change réellement
+                    if percent != self._last_pct:
+                        self._last_pct = percent
+                        self.progress.emit(percent)
+            elif d['status'] == 'finished':
+                self.progress.emit(100)
+                # NOUVEAU : Stocker le fichier temporaire pour les vidéos
+                if self.format_type in ['mp4', 'video']:
+                    self.temp_file = d['filename']
+                    # Mémorise le codec audio choisi par yt-dlp pour éviter
+                    # une vérification ffprobe inutile après coup
+                    self._downloaded_acodec = d.get('info_dict', {}).get('acodec')
+                self.status.emit("Téléchargement terminé, finalisation...")
+        
+        print(f"format type : {self.format_type}")
+
+        return self.build_ydl_opts(self.format_type, self.quality, self.output_path,
+                                   cookies_file=self.cookies_file,
+                                   progress_hook=progress_hook)
+
+    @classmethod
+    def build_ydl_opts(cls, format_type, quality, output_path,
+                       cookies_file=None, progress_hook=None):
+        """Construit le dictionnaire d'options yt-dlp pour un téléchargement.
+
+        Méthode de classe pour que PlaylistDownloader puisse construire les
+        options une seule fois sans instancier un worker par vidéo.
+        """
+        # Template de nom de fichier - MODIFIÉ
+        if format_type in ['mp4', 'video']:
+            filename_template = '%(title)s_temp.%(ext)s'
+        else:
+            filename_template = '%(title)s.%(ext)s'
+
+        # Options de base
+        ydl_opts = {
+            'outtmpl': str(Path(output_path) / filename_template),
+            # Fragments DASH/HLS téléchargés en parallèle par yt-dlp lui-même
+            'concurrent_fragment_downloads': min(os.cpu_count() or 1, 8),
+        }
+
+        # Téléchargeur externe multi-connexions quand aria2c est disponible ;
+        # repli silencieux sur le téléchargeur interne sinon
+        if _ARIA2C:
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = {
+                'aria2c': ['-x', '16', '-s', '16', '-k', '1M'],
+            }
+
+        if progress_hook:
+            ydl_opts['progress_hooks'] = [progress_hook]
+
+        # Configuration selon le format souhaité
+        if format_type == 'mp3' or format_type == 'audio':
+            ydl_opts.update({
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'mp3',
+                    'preferredquality': '192',
+                }],
+            })
+        elif format_type == 'mp4' or format_type == 'video':
+            # NOUVEAU : Format optimisé pour éviter l'Opus
+            ydl_opts.update({
+                'format': (
+                    'bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[acodec=aac]/'
+                    'bestvideo[ext=mp4]+bestaudio[acodec=aac]/'
+                    'bestvideo[ext=mp4]+140/'  # Format 140 = AAC
+                    'best[ext=mp4]'
+                ),
+                'merge_output_format': 'mp4',
+                # Pas de post-processeur ici, on le fera manuellement
+            })
+
+        if cookies_file:
+            ydl_opts['cookiefile'] = cookies_file
+
+        return ydl_opts
+    
+    @staticmethod
+    def _is_aac_codec(acodec):
+        """Vérifie si un codec annoncé par yt-dlp est déjà de l'AAC"""
+        if not acodec:
+            return False
+        # yt-dlp annonce l'AAC sous forme 'aac' ou 'mp4a.40.2'
+        return acodec.split('.')[0].lower() in ('aac', 'mp4a')
+
+    def _ensure_aac_audio(self):
+        """NOUVELLE MÉTHODE : S'assure que l'audio est en AAC"""
+        if not self.temp_file:
+            return
+
+        # Un seul os.stat : les gardes exists() qui suivaient refaisaient
+        # chacune le même appel système
+        try:
+            os.stat(self.temp_file)
+        except OSError:
+            return
+
+        try:
+            # Vérifier le codec audio
+            audio_codec = self._get_audio_codec(self.temp_file)
+            print(f"Codec audio détecté: {audio_codec}")
+            
+            # Nom du fichier final
+            final_file = self.temp_file.replace('_temp.mp4', '.mp4')
+            
+            if audio_codec != 'aac':
+                self.status.emit("Conversion audio vers AAC...")
+                print("Conversion audio nécessaire...")
+                self._convert_to_aac(self.temp_file, final_file)
+            else:
+                print("Audio déjà en AAC, simple renommage...")
+                os.replace(self.temp_file, final_file)
+                
+        except Exception as e:
+            print(f"Erreur lors de la conversion audio: {e}")
+            # En cas d'erreur, renommer le fichier temporaire
+            final_file = self.temp_file.replace('_temp.mp4', '_original.mp4')
+            try:
+                os.replace(self.temp_file, final_file)
+            except FileNotFoundError:
+                pass
+    
+    def _get_audio_codec(self, file_path):
+        """NOUVELLE MÉTHODE : Détecte le codec audio d'un fichier"""
+        return _probe_codec_cached(file_path)
+    
+    def _convert_to_aac(self, input_file, output_file):
+        """NOUVELLE MÉTHODE : Convertit l'audio en AAC"""
+        # Conversion lancée dans ce thread avec le handle Popen suivi :
+        # cancel() peut ainsi terminer ffmpeg immédiatement au lieu de
+        # laisser l'encodage abandonné tourner jusqu'au bout
+        def remember_proc(proc):
+            self._proc = proc
+
+        try:
+            success = _run_aac_convert(input_file, output_file, _FFMPEG,
+                                       on_start=remember_proc)
+        finally:
+            self._proc = None
+
+        if self.is_cancelled:
+            return
+
+        # try/except plutôt que exists() + opération : un seul appel système
+        # au lieu d'un stat suivi de l'opération
+        if success:
+            print("Conversion audio réussie !")
+
+            # Supprimer le fichier temporaire
+            try:
+                Path(input_file).unlink()
+            except FileNotFoundError:
+                pass
+        else:
+            # En cas d'erreur, renommer le fichier original
+            try:
+                os.replace(input_file, output_file)
+            except FileNotFoundError:
+                pass
+    
+    def _get_audio_quality(self):
+        """Convertit la qualité en paramètre pour FFmpeg"""
+        quality_map = {
+            'best': '0',      # VBR haute qualité
+            'high': '2',      # ~190 kbps
+            'medium': '4',    # ~165 kbps
+            'low': '7',       # ~100 kbps
+        }
+        return quality_map.get(self.quality, '0')
+    
+    def cancel(self):
+        """Annule le téléchargement"""
+        self.is_cancelled = True
+
+        # Termine immédiatement un éventuel ffmpeg en cours plutôt que de
+        # le laisser consommer un cœur sur un encodage abandonné
+        proc = self._proc
+        if proc and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+class MediaConverter:
+    """Classe pour les conversions de médias avec FFmpeg"""
+    
+    # Disponibilité de ffmpeg : ne change pas pendant la vie du processus,
+    # donc on ne sonde qu'une seule fois
+    _ffmpeg_available = None
+
+    @classmethod
+    def is_ffmpeg_available(cls):
+        """Vérifie si FFmpeg est disponible (résultat mis en cache)"""
+        if cls._ffmpeg_available is None:
+            try:
+                # Seul le code de retour compte : pas de pipes à allouer
+                # ni de sortie à décoder
+                subprocess.run([_FFMPEG, '-version'],
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, check=True)
+                cls._ffmpeg_available = True
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                cls._ffmpeg_available = False
+        return cls._ffmpeg_available
+    
+    @staticmethod
+    def convert_audio(input_path, output_path, target_format, quality='medium'):
+        """Convertit un fichier audio"""
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Fichier source introuvable: {input_path}")
+        
+        # Commande FFmpeg de base
+        cmd = [_FFMPEG, '-i', str(input_path), '-y']  # -y pour écraser
+        
+        # Configuration selon le format cible
+        if target_format.lower() == 'mp3':
+            quality_map = {
+                'low': '128k',
+                'medium': '192k',
+                'high': '320k'
+            }
+            bitrate = quality_map.get(quality, '192k')
+            cmd.extend(['-codec:a', 'libmp3lame', '-b:a', bitrate])
+        
+        elif target_format.lower() == 'wav':
+            cmd.extend(['-codec:a', 'pcm_s16le'])
+        
+        elif target_format.lower() == 'aac':
+            quality_map = {
+                'low': '96k',
+                'medium': '128k',
+                'high': '256k'
+            }
+            bitrate = quality_map.get(quality, '128k')
+            cmd.extend(['-codec:a', 'aac', '-b:a', bitrate])
+        
+        cmd.append(str(output_path))
+
+        # Exécution de la conversion en flux (pas de buffer stderr complet)
+        returncode = _run_ffmpeg_streaming(cmd)
+        if returncode == 0:
+            return True, "Conversion réussie"
+        return False, f"Erreur FFmpeg (code {returncode})"
+    
+    @staticmethod
+    def ensure_aac_audio(input_path, output_path=None):
+        """NOUVELLE MÉTHODE : S'assure que le fichier a un audio AAC compatible"""
+        input_path = Path(input_path)
+        if output_path is None:
+            output_path = input_path.parent / f"{input_path.stem}_aac{input_path.suffix}"
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Fichier source introuvable: {input_path}")
+        
+        cmd = [
+            _FFMPEG, '-y', '-i', str(input_path),
+            '-c:v', 'copy',           # Copie la vidéo
+            '-c:a', 'aac',            # Force AAC
+            '-b:a', '192k',           # Bitrate
+            '-ac', '2',               # Stéréo
+            '-ar', '44100',           # Fréquence
+            '-movflags', '+faststart', # Optimisation
+            str(output_path)
+        ]
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return True, f"Conversion réussie: {output_path}"
+        except subprocess.CalledProcessError as e:
+            return False, f"Erreur FFmpeg: {e.stderr}"
+    
+    @staticmethod
+    def batch_ensure_aac(files):
+        """NOUVELLE MÉTHODE : Convertit plusieurs fichiers en un seul ffmpeg.
+
+        Amortit le coût de démarrage de ffmpeg (processus + init codecs)
+        sur tout le lot : une invocation avec plusieurs -i / -map au lieu
+        d'un processus par fichier.
+        """
+        files = [(str(inp), str(out)) for inp, out in files]
+        if not files:
+            return True, "Aucun fichier à convertir"
+
+        cmd = [_FFMPEG, '-y']
+        for input_path, _ in files:
+            cmd.extend(['-i', input_path])
+        for index, (_, output_path) in enumerate(files):
+            cmd.extend([
+                '-map', str(index),
+                '-c:v', 'copy',           # Copie la vidéo
+                '-c:a', 'aac',            # Force AAC
+                '-b:a', '192k',           # Bitrate
+                '-movflags', '+faststart', # Optimisation
+                output_path
+            ])
+
+        returncode = _run_ffmpeg_streaming(cmd)
+        if returncode == 0:
+            return True, f"Conversion réussie: {len(files)} fichiers"
+        return False, f"Erreur FFmpeg (code {returncode})"
+
+    @staticmethod
+    def check_audio_codec(file_path):
+        """NOUVELLE MÉTHODE : Vérifie le codec audio d'un fichier"""
+        return _probe_codec_cached(str(file_path))
+    
+    @staticmethod
+    def get_media_info(file_path):
+        """Récupère les informations d'un fichier média"""
+        return _media_info_cached(str(file_path))
+
+
+class PlaylistDownloader(QThread):
+    """Worker pour télécharger des playlists"""
+    
+    progress = pyqtSignal(int, int)  # current, total
+    video_finished = pyqtSignal(str, bool)  # title, success
+    all_finished = pyqtSignal(bool, str)
+    
+    def __init__(self, url, output_path, format_type="mp3", quality="best", concurrency=4):
+        super().__init__()
+        self.url = url
+        self.output_path = Path(output_path)
+        self.format_type = format_type
+        self.quality = quality
+        self.concurrency = max(1, concurrency)
+        self.is_cancelled = False
+
+    def run(self):
+        """Télécharge une playlist complète"""
+        try:
+            # Configuration pour extraire les informations de la playlist
+            ydl_opts = {
+                'extract_flat': True,
+                'quiet': True,
+            }
+
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                playlist_info = ydl.extract_info(self.url, download=False)
+
+            if 'entries' not in playlist_info:
+                self.all_finished.emit(False, "Ce n'est pas une playlist valide")
+                return
+
+            entries = playlist_info['entries']
+            total_videos = len(entries)
+
+            # Options yt-dlp construites une seule fois pour toute la playlist :
+            # chaque construction de YoutubeDL recharge extracteurs et cookies
+            self._ydl_opts = DownloadWorker.build_ydl_opts(
+                self.format_type, self.quality, self.output_path)
+            self._local = threading.local()
+
+            # En mode séquentiel, yt-dlp gère la playlist nativement au lieu
+            # d'une boucle Python entrée par entrée
+            if self.concurrency == 1:
+                self._download_playlist_native(total_videos)
+                if not self.is_cancelled:
+                    self._batch_convert_temp_files()
+                    self.all_finished.emit(True, f"Playlist téléchargée: {total_videos} vidéos")
+                return
+
+            # Téléchargement des vidéos en parallèle (borné par self.concurrency) :
+            # les téléchargements sont limités par le réseau, donc les threads
+            # permettent de recouvrir les attentes réseau entre vidéos
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {}
+                for i, entry in enumerate(entries):
+                    video_title = entry.get('title', f'Vidéo {i+1}')
+
+                    # L'entrée aplatie est passée telle quelle : yt-dlp ne la
+                    # résoudra qu'une seule fois, au moment du téléchargement
+                    futures[executor.submit(self._download_single_video, entry)] = video_title
+
+                completed = 0
+                for future in as_completed(futures):
+                    if self.is_cancelled:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+                    success = future.result()
+                    completed += 1
+                    self.video_finished.emit(futures[future], success)
+                    self.progress.emit(completed, total_videos)
+
+            if not self.is_cancelled:
+                self._batch_convert_temp_files()
+                self.all_finished.emit(True, f"Playlist téléchargée: {total_videos} vidéos")
+
+        except Exception as e:
+            self.all_finished.emit(False, f"Erreur playlist: {str(e)}")
+
+    def _batch_convert_temp_files(self):
+        """Convertit en un seul ffmpeg les fichiers _temp laissés par les vidéos"""
+        if self.format_type not in ['mp4', 'video']:
+            return
+
+        pending = [(str(p), str(p).replace('_temp.mp4', '.mp4'))
+                   for p in self.output_path.glob('*_temp.mp4')]
+        if not pending:
+            return
+
+        success, message = MediaConverter.batch_ensure_aac(pending)
+        if success:
+            for input_path, _ in pending:
+                try:
+                    Path(input_path).unlink()
+                except FileNotFoundError:
+                    pass
+        else:
+            print(f"Échec de la conversion groupée: {message}")
+    
+    def _download_playlist_native(self, total_videos):
+        """Télécharge la playlist via le support natif de yt-dlp.
+
+        yt-dlp enchaîne lui-même les entrées (et parallélise les fragments
+        de chaque vidéo) ; les signaux par vidéo sont émis depuis le hook
+        de progression en détectant les changements de playlist_index.
+        """
+        seen_indexes = set()
+
+        def progress_hook(d):
+            if self.is_cancelled:
+                raise yt_dlp.DownloadError("Téléchargement annulé")
+
+            if d['status'] == 'finished':
+                info = d.get('info_dict', {})
+                index = info.get('playlist_index')
+                # Plusieurs flux (vidéo + audio) se terminent pour une même
+                # entrée : on n'émet qu'une fois par index
+                if index is not None and index not in seen_indexes:
+                    seen_indexes.add(index)
+                    self.video_finished.emit(info.get('title', f'Vidéo {index}'), True)
+                    self.progress.emit(len(seen_indexes), total_videos)
+
+        ydl_opts = dict(self._ydl_opts)
+        ydl_opts['progress_hooks'] = [progress_hook]
+        ydl_opts['ignoreerrors'] = True  # Une vidéo en échec n'arrête pas la playlist
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([self.url])
+        except yt_dlp.DownloadError:
+            # Annulation demandée via le hook
+            pass
+
+    def _thread_ydl(self):
+        """Retourne l'instance YoutubeDL propre au thread courant.
+
+        YoutubeDL n'est pas thread-safe : chaque thread du pool garde la
+        sienne et la réutilise entre les vidéos au lieu d'en reconstruire
+        une par entrée.
+        """
+        if not hasattr(self._local, 'ydl'):
+            self._local.ydl = yt_dlp.YoutubeDL(self._ydl_opts)
+        return self._local.ydl
+
+    def _download_single_video(self, entry):
+        """Télécharge une seule entrée de playlist de façon synchrone"""
+        if self.is_cancelled:
+            return False
+
+        try:
+            self._thread_ydl().process_ie_result(dict(entry), download=True)
+            return True
+        except Exception:
+            return False
+    
+    def cancel(self):
+        """Annule le téléchargement de la playlist"""
+        self.is_cancelled = True
+
+
+# NOUVELLE FONCTION UTILITAIRE pour corriger les fichiers existants
+def fix_existing_mp4_audio(file_path):
+    """
+    Corrige l'audio d'un fichier MP4 existant
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        print(f"Fichier introuvable: {file_path}")
+        return False
+    
+    # Vérifier le codec audio
+    codec = MediaConverter.check_audio_codec(file_path)
+    print(f"Codec audio détecté: {codec}")
+    
+    if codec == 'aac':
+        print("Le fichier a déjà un audio AAC compatible")
+        return True
+    
+    # Créer le fichier corrigé
+    output_path = file_path.parent / f"{file_path.stem}_fixed.mp4"
+    success, message = MediaConverter.ensure_aac_audio(file_path, output_path)
+    
+    if success:
+        print(f"Fichier corrigé créé: {output_path}")
+        return True
+    else:
+        print(f"Échec de la correction: {message}")
         return False
\ No newline at end of file
@@ -1,446 +1,489 @@
-import re
-import os
-import json
-import subprocess
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import yt_dlp
-from ffmpeg import get_fmpeg_path
-
-
-def sanitize_filename(filename: str) -> str:
-    """
-    Nettoie un nom de fichier en supprimant les caractères interdits
-    """
-    # Caractères interdits sous Windows et autres OS
-    forbidden_chars = r'[<>:"/\\|?*]'
-    
-    # Remplace les caractères interdits par des underscores
-    sanitized = re.sub(forbidden_chars, '_', filename)
-    
-    # Supprime les espaces en début/fin
-    sanitized = sanitized.strip()
-    
-    # Supprime les points en fin (problématique sous Windows)
-    sanitized = sanitized.rstrip('.')
-    
-    # Limite la longueur (255 caractères max pour la plupart des systèmes)
-    if len(sanitized) > 200:  # Garde de la marge pour l'extension
-        sanitized = sanitized[:200]
-    
-    # Si le nom est vide après nettoyage, utilise un nom par défaut
-    if not sanitized:
-        sanitized = "fichier_sans_nom"
-    
-    return sanitized
-
-
-def format_time(seconds: int) -> str:
-    """
-    Formate une durée en secondes vers le format HH:MM:SS ou MM:SS
-    """
-    if seconds < 0:
-        return "00:00"
-    
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    seconds = seconds % 60
-    
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    else:
-        return f"{minutes:02d}:{seconds:02d}"
-
-
-def format_size(bytes_size: int) -> str:
-    """
-    Formate une taille en octets vers une chaîne lisible (KB, MB, GB)
-    """
-    if bytes_size < 0:
-        return "0 B"
-    
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    size = float(bytes_size)
-    
-    for unit in units:
-        if size < 1024.0:
-            if unit == 'B':
-                return f"{int(size)} {unit}"
-            else:
-                return f"{size:.1f} {unit}"
-        size /= 1024.0
-    
-    return f"{size:.1f} PB"
-
-
-def format_number(number: int) -> str:
-    """
-    Formate un nombre avec des séparateurs de milliers
-    """
-    if number < 0:
-        return "0"
-    
-    return f"{number:,}".replace(',', ' ')
-
-
-def is_valid_url(url: str) -> bool:
-    """
-    Vérifie si une URL est valide pour YouTube/autres plateformes supportées
-    """
-    if not url or not isinstance(url, str):
-        return False
-    
-    # Patterns pour les URLs supportées
-    patterns = [
-        r'https?://(www\.)?(youtube\.com|youtu\.be)',
-        r'https?://(www\.)?soundcloud\.com',
-        r'https?://(www\.)?vimeo\.com',
-        r'https?://(www\.)?dailymotion\.com',
-        r'https?://(www\.)?twitch\.tv',
-    ]
-    
-    for pattern in patterns:
-        if re.match(pattern, url, re.IGNORECASE):
-            return True
-    
-    return False
-
-
-def extract_video_id(url: str) -> Optional[str]:
-    """
-    Extrait l'ID d'une vidéo YouTube depuis son URL
-    """
-    patterns = [
-        r'youtube\.com/watch\?v=([^&]+)',
-        r'youtu\.be/([^?]+)',
-        r'youtube\.com/embed/([^?]+)',
-        r'youtube\.com/v/([^?]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    
-    return None
-
-
-def get_available_formats(url: str) -> List[Dict]:
-    """
-    Récupère les formats disponibles pour une URL donnée
-    """
-    try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-        formats = []
-        seen_formats = set()
-        
-        for fmt in info.get('formats', []):
-            # Informations de base
-            format_id = fmt.get('format_id', 'unknown')
-            ext = fmt.get('ext', 'unknown')
-            quality = fmt.get('quality', 0)
-            filesize = fmt.get('filesize', 0)
-            
-            # Informations vidéo
-            height = fmt.get('height')
-            width = fmt.get('width')
-            fps = fmt.get('fps')
-            vcodec = fmt.get('vcodec', 'none')
-            
-            # Informations audio
-            acodec = fmt.get('acodec', 'none')
-            abr = fmt.get('abr')  # Audio bitrate
-            
-            # Création d'une clé unique pour éviter les doublons
-            key = (ext, height, width, vcodec, acodec)
-            if key in seen_formats:
-                continue
-            seen_formats.add(key)
-            
-            # Description du format
-            description_parts = []
-            
-            if height and width:
-                description_parts.append(f"{height}p")
-            elif height:
-                description_parts.append(f"{height}p")
-            
-            if fps and fps > 30:
-                description_parts.append(f"{fps}fps")
-            
-            if vcodec != 'none' and acodec != 'none':
-                description_parts.append("vidéo+audio")
-            elif vcodec != 'none':
-                description_parts.append("vidéo seule")
-            elif acodec != 'none':
-                description_parts.append("audio seul")
-                if abr:
-                    description_parts.append(f"{abr}kbps")
-            
-            description = " ".join(description_parts) if description_parts else "Format inconnu"
-            
-            formats.append({
-                'format_id': format_id,
-                'ext': ext,
-                'description': description,
-                'filesize': filesize,
-                'height': height,
-                'width': width,
-                'fps': fps,
-                'vcodec': vcodec,
-                'acodec': acodec,
-                'abr': abr,
-                'quality': quality,
-                'is_video': vcodec != 'none',
-                'is_audio': acodec != 'none',
-            })
-        
-        # Tri par qualité (vidéo d'abord, puis audio)
-        formats.sort(key=lambda x: (
-            not x['is_video'],  # Vidéos en premier
-            -(x['height'] or 0),  # Hauteur décroissante
-            -(x['abr'] or 0),  # Bitrate audio décroissant
-        ))
-        
-        return formats
-        
-    except Exception as e:
-        print(f"Erreur lors de l'extraction des formats: {e}")
-        return []
-
-
-def get_video_info(url: str) -> Optional[Dict]:
-    """
-    Récupère les informations détaillées d'une vidéo
-    """
-    try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-        
-        # Extraction des informations importantes
-        video_info = {
-            'title': info.get('title', 'Titre inconnu'),
-            'description': info.get('description', ''),
-            'uploader': info.get('uploader', 'Inconnu'),
-            'upload_date': info.get('upload_date', ''),
-            'duration': info.get('duration', 0),
-            'view_count': info.get('view_count', 0),
-            'like_count': info.get('like_count', 0),
-            'thumbnail': info.get('thumbnail', ''),
-            'webpage_url': info.get('webpage_url', url),
-            'id': info.get('id', ''),
-            'ext': info.get('ext', 'mp4'),
-            'filesize': info.get('filesize', 0),
-            'categories': info.get('categories', []),
-            'tags': info.get('tags', []),
-        }
-        
-        return video_info
-        
-    except Exception as e:
-        print(f"Erreur lors de l'extraction des infos: {e}")
-        return None
-
-
-def is_playlist_url(url: str) -> bool:
-    """
-    Vérifie si l'URL correspond à une playlist
-    """
-    playlist_patterns = [
-        r'youtube\.com/playlist\?list=',
-        r'youtube\.com/watch\?.*list=',
-        r'soundcloud\.com/.+/sets/',
-    ]
-    
-    for pattern in playlist_patterns:
-        if re.search(pattern, url, re.IGNORECASE):
-            return True
-    
-    return False
-
-
-def get_playlist_info(url: str) -> Optional[Dict]:
-    """
-    Récupère les informations d'une playlist
-    """
-    try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,  # Ne télécharge pas, juste les infos
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-        
-        if 'entries' not in info:
-            return None
-        
-        playlist_info = {
-            'title': info.get('title', 'Playlist sans nom'),
-            'description': info.get('description', ''),
-            'uploader': info.get('uploader', 'Inconnu'),
-            'video_count': len(info['entries']),
-            'id': info.get('id', ''),
-            'webpage_url': info.get('webpage_url', url),
-            'entries': []
-        }
-        
-        # Informations sur chaque vidéo
-        for entry in info['entries'][:10]:  # Limite à 10 pour l'aperçu
-            if entry:
-                playlist_info['entries'].append({
-                    'title': entry.get('title', 'Titre inconnu'),
-                    'id': entry.get('id', ''),
-                    'duration': entry.get('duration', 0),
-                    'url': entry.get('url', ''),
-                })
-        
-        return playlist_info
-        
-    except Exception as e:
-        print(f"Erreur lors de l'extraction de la playlist: {e}")
-        return None
-
-
-def create_output_directory(path: str) -> bool:
-    """
-    Crée le répertoire de sortie s'il n'existe pas
-    """
-    try:
-        Path(path).mkdir(parents=True, exist_ok=True)
-        return True
-    except Exception as e:
-        print(f"Erreur lors de la création du dossier: {e}")
-        return False
-
-
-def get_default_download_path() -> str:
-    """
-    Retourne le chemin de téléchargement par défaut
-    """
-    # Dossier Téléchargements de l'utilisateur
-    downloads_path = Path.home() / "Downloads" / "YT-Downloader"
-    
-    # Crée le dossier s'il n'existe pas
-    create_output_directory(str(downloads_path))
-    
-    return str(downloads_path)
-
-
-def validate_output_path(path: str) -> Tuple[bool, str]:
-    """
-    Valide un chemin de sortie
-    """
-    if not path:
-        return False, "Chemin vide"
-    
-    path_obj = Path(path)
-    
-    # Vérifie si le dossier parent existe ou peut être créé
-    try:
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        return False, f"Impossible de créer le dossier: {e}"
-    
-    # Vérifie les permissions d'écriture
-    try:
-        # Test de création d'un fichier temporaire
-        test_file = path_obj.parent / "test_write_permission.tmp"
-        test_file.touch()
-        test_file.unlink()
-    except Exception as e:
-        return False, f"Pas de permission d'écriture: {e}"
-    
-    return True, "Chemin valide"
-
-
-def load_settings(settings_file: str = "settings.json") -> Dict:
-    """
-    Charge les paramètres depuis un fichier JSON
-    """
-    default_settings = {
-        'output_path': get_default_download_path(),
-        'default_format': 'mp3',
-        'default_quality': 'medium',
-        'create_subfolders': True,
-        'overwrite_files': False,
-        'max_concurrent_downloads': 3,
-        'theme': 'dark',
-        'language': 'fr',
-    }
-    
-    try:
-        settings_path = Path(settings_file)
-        if settings_path.exists():
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                loaded_settings = json.load(f)
-                # Fusionne avec les paramètres par défaut
-                default_settings.update(loaded_settings)
-    except Exception as e:
-        print(f"Erreur lors du chargement des paramètres: {e}")
-    
-    return default_settings
-
-
-def save_settings(settings: Dict, settings_file: str = "settings.json") -> bool:
-    """
-    Sauvegarde les paramètres dans un fichier JSON
-    """
-    try:
-        with open(settings_file, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"Erreur lors de la sauvegarde des paramètres: {e}")
-        return False
-
-
-def check_dependencies() -> Dict[str, bool]:
-    """
-    Vérifie que les dépendances nécessaires sont installées
-    """
-    dependencies = {
-        'yt-dlp': False,
-        get_fmpeg_path(): False,
-        'ffprobe': False,
-    }
-    
-    # Test yt-dlp
-    try:
-        import yt_dlp
-        dependencies['yt-dlp'] = True
-    except ImportError:
-        pass
-    
-    # Test FFmpeg
-    try:
-        subprocess.run([get_fmpeg_path(), '-version'], 
-                      capture_output=True, check=True)
-        dependencies[get_fmpeg_path()] = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    # Test FFprobe
-    try:
-        subprocess.run(['ffprobe', '-version'], 
-                      capture_output=True, check=True)
-        dependencies['ffprobe'] = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    return dependencies
\ No newline at end of file
+import re
+import os
+import heapq
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ffmpeg import get_fmpeg_path
+
+# yt_dlp est importé paresseusement dans les fonctions qui l'utilisent :
+# son chargement tire ~1500 modules d'extracteurs, un coût payé au
+# démarrage alors que l'utilisateur n'a encore collé aucune URL
+
+# Options partagées pour les extractions de métadonnées : on ne télécharge
+# jamais ici, et sauter le manifeste DASH + les requêtes de configuration du
+# player évite un aller-retour réseau et divise la liste de formats par deux
+FAST_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'youtube_include_dash_manifest': False,
+    'extractor_args': {'youtube': {'player_skip': ['configs']}},
+}
+
+
+# Table de transposition des caractères interdits (Windows et autres OS) :
+# une seule passe str.translate au lieu d'une regex réévaluée par appel
+_FORBIDDEN_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Expressions régulières compilées une fois : ces validations tournent
+# potentiellement pour chaque entrée d'une playlist. Une seule alternation
+# pour les plateformes supportées : un passage du moteur au lieu de cinq
+_VALID_URL_RE = re.compile(
+    r'https?://(www\.)?'
+    r'(youtube\.com|youtu\.be|soundcloud\.com|vimeo\.com'
+    r'|dailymotion\.com|twitch\.tv)',
+    re.IGNORECASE,
+)
+
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'youtube\.com/watch\?v=([^&]+)', re.IGNORECASE),
+    re.compile(r'youtu\.be/([^?]+)', re.IGNORECASE),
+    re.compile(r'youtube\.com/embed/([^?]+)', re.IGNORECASE),
+    re.compile(r'youtube\.com/v/([^?]+)', re.IGNORECASE),
+]
+
+_PLAYLIST_PATTERNS = [
+    re.compile(r'youtube\.com/playlist\?list=', re.IGNORECASE),
+    re.compile(r'youtube\.com/watch\?.*list=', re.IGNORECASE),
+    re.compile(r'soundcloud\.com/.+/sets/', re.IGNORECASE),
+]
+
+
+def sanitize_filename(filename: str) -> str:
+    """
+    Nettoie un nom de fichier en supprimant les caractères interdits
+    """
+    # Une passe unique : remplacement, espaces, points finaux, longueur
+    # (255 caractères max pour la plupart des systèmes, marge pour l'extension)
+    sanitized = filename.translate(_FORBIDDEN_TABLE).strip().rstrip('.')[:200]
+
+    # Si le nom est vide après nettoyage, utilise un nom par défaut
+    if not sanitized:
+        sanitized = "fichier_sans_nom"
+
+    return sanitized
+
+
+def format_time(seconds: int) -> str:
+    """
+    Formate une durée en secondes vers le format HH:MM:SS ou MM:SS
+    """
+    if seconds < 0:
+        return "00:00"
+
+    # Un seul enchaînement divmod : ces fonctions tournent à chaque
+    # rafraîchissement de la progression pendant un téléchargement
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    else:
+        return f"{minutes:02d}:{seconds:02d}"
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def format_size(bytes_size: int) -> str:
+    """
+    Formate une taille en octets vers une chaîne lisible (KB, MB, GB)
+    """
+    if bytes_size <= 0:
+        return "0 B"
+
+    # L'index de l'unité se déduit de la position du bit de poids fort
+    # (1024 = 2^10), ce qui évite la boucle de divisions successives
+    idx = min((bytes_size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+
+    if idx == 0:
+        return f"{bytes_size} B"
+    return f"{bytes_size / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+
+
+def format_number(number: int) -> str:
+    """
+    Formate un nombre avec des séparateurs de milliers
+    """
+    if number < 0:
+        return "0"
+    
+    return f"{number:,}".replace(',', ' ')
+
+
+def is_valid_url(url: str) -> bool:
+    """
+    Vérifie si une URL est valide pour YouTube/autres plateformes supportées
+    """
+    return bool(url and isinstance(url, str) and _VALID_URL_RE.match(url))
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    Extrait l'ID d'une vidéo YouTube depuis son URL
+    """
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+
+    return None
+
+
+def get_available_formats(url: str, info: Optional[Dict] = None) -> List[Dict]:
+    """
+    Récupère les formats disponibles pour une URL donnée
+    (réutilise une extraction `info` déjà faite si l'appelant en fournit une)
+    """
+    try:
+        if info is None:
+            import yt_dlp
+
+            with yt_dlp.YoutubeDL(FAST_YDL_OPTS) as ydl:
+                info = ydl.extract_info(url, download=False)
+
+        # Déduplication par créneau (extension, hauteur, présence vidéo/audio) :
+        # on garde le format au meilleur débit total plutôt que le premier
+        # rencontré dans l'ordre arbitraire de yt-dlp
+        best_by_slot = {}
+        for fmt in info.get('formats', []):
+            vcodec = fmt.get('vcodec', 'none')
+            acodec = fmt.get('acodec', 'none')
+            key = (fmt.get('ext', 'unknown'), fmt.get('height'),
+                   vcodec != 'none', acodec != 'none')
+            current = best_by_slot.get(key)
+            if current is None or (fmt.get('tbr') or 0) > (current.get('tbr') or 0):
+                best_by_slot[key] = fmt
+
+        formats = []
+        for fmt in best_by_slot.values():
+            # Informations de base
+            format_id = fmt.get('format_id', 'unknown')
+            ext = fmt.get('ext', 'unknown')
+            quality = fmt.get('quality', 0)
+            filesize = fmt.get('filesize', 0)
+            
+            # Informations vidéo
+            height = fmt.get('height')
+            width = fmt.get('width')
+            fps = fmt.get('fps')
+            vcodec = fmt.get('vcodec', 'none')
+            
+            # Informations audio
+            acodec = fmt.get('acodec', 'none')
+            abr = fmt.get('abr')  # Audio bitrate
+            
+            # Description du format
+            description_parts = []
+            
+            if height and width:
+                description_parts.append(f"{height}p")
+            elif height:
+                description_parts.append(f"{height}p")
+            
+            if fps and fps > 30:
+                description_parts.append(f"{fps}fps")
+            
+            if vcodec != 'none' and acodec != 'none':
+                description_parts.append("vidéo+audio")
+            elif vcodec != 'none':
+                description_parts.append("vidéo seule")
+            elif acodec != 'none':
+                description_parts.append("audio seul")
+                if abr:
+                    description_parts.append(f"{abr}kbps")
+            
+            description = " ".join(description_parts) if description_parts else "Format inconnu"
+            
+            formats.append({
+                'format_id': format_id,
+                'ext': ext,
+                'description': description,
+                'filesize': filesize,
+                'height': height,
+                'width': width,
+                'fps': fps,
+                'vcodec': vcodec,
+                'acodec': acodec,
+                'abr': abr,
+                'quality': quality,
+                'is_video': vcodec != 'none',
+                'is_audio': acodec != 'none',
+            })
+        
+        # Les appelants n'affichent que le haut de la liste : un tas partiel
+        # (O(n log k)) suffit au lieu d'un tri complet de tous les formats
+        return heapq.nsmallest(20, formats, key=lambda x: (
+            not x['is_video'],  # Vidéos en premier
+            -(x['height'] or 0),  # Hauteur décroissante
+            -(x['abr'] or 0),  # Bitrate audio décroissant
+        ))
+        
+    except Exception as e:
+        print(f"Erreur lors de l'extraction des formats: {e}")
+        return []
+
+
+def get_video_info(url: str, info: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Récupère les informations détaillées d'une vidéo
+    (réutilise une extraction `info` déjà faite si l'appelant en fournit une)
+    """
+    try:
+        if info is None:
+            import yt_dlp
+
+            with yt_dlp.YoutubeDL(FAST_YDL_OPTS) as ydl:
+                info = ydl.extract_info(url, download=False)
+
+        # Extraction des informations importantes
+        video_info = {
+            'title': info.get('title', 'Titre inconnu'),
+            'description': info.get('description', ''),
+            'uploader': info.get('uploader', 'Inconnu'),
+            'upload_date': info.get('upload_date', ''),
+            'duration': info.get('duration', 0),
+            'view_count': info.get('view_count', 0),
+            'like_count': info.get('like_count', 0),
+            'thumbnail': info.get('thumbnail', ''),
+            'webpage_url': info.get('webpage_url', url),
+            'id': info.get('id', ''),
+            'ext': info.get('ext', 'mp4'),
+            'filesize': info.get('filesize', 0),
+            'categories': info.get('categories', []),
+            'tags': info.get('tags', []),
+        }
+        
+        return video_info
+        
+    except Exception as e:
+        print(f"Erreur lors de l'extraction des infos: {e}")
+        return None
+
+
+def is_playlist_url(url: str) -> bool:
+    """
+    Vérifie si l'URL correspond à une playlist
+    """
+    for pattern in _PLAYLIST_PATTERNS:
+        if pattern.search(url):
+            return True
+
+    return False
+
+
+def get_playlist_info(url: str) -> Optional[Dict]:
+    """
+    Récupère les informations d'une playlist
+    """
+    try:
+        import yt_dlp
+
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            # 'in_playlist' : yt-dlp s'arrête à l'index des entrées, sans
+            # résoudre chaque vidéo ; playlistend borne le parcours à
+            # l'aperçu au lieu de matérialiser des playlists entières
+            'extract_flat': 'in_playlist',
+            'playlistend': 10,
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        if 'entries' not in info:
+            return None
+
+        playlist_info = {
+            'title': info.get('title', 'Playlist sans nom'),
+            'description': info.get('description', ''),
+            'uploader': info.get('uploader', 'Inconnu'),
+            # Le compte vient de l'en-tête de la playlist, pas des entrées
+            'video_count': info.get('playlist_count') or info.get('n_entries') or 0,
+            'id': info.get('id', ''),
+            'webpage_url': info.get('webpage_url', url),
+            'entries': []
+        }
+
+        # Informations sur chaque vidéo (déjà limitées par playlistend)
+        for entry in info['entries']:
+            if entry:
+                playlist_info['entries'].append({
+                    'title': entry.get('title', 'Titre inconnu'),
+                    'id': entry.get('id', ''),
+                    'duration': entry.get('duration', 0),
+                    'url': entry.get('url', ''),
+                })
+        
+        return playlist_info
+        
+    except Exception as e:
+        print(f"Erreur lors de l'extraction de la playlist: {e}")
+        return None
+
+
+def create_output_directory(path: str) -> bool:
+    """
+    Crée le répertoire de sortie s'il n'existe pas
+    """
+    try:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        return True
+    except Exception as e:
+        print(f"Erreur lors de la création du dossier: {e}")
+        return False
+
+
+def get_default_download_path() -> str:
+    """
+    Retourne le chemin de téléchargement par défaut
+    """
+    # Dossier Téléchargements de l'utilisateur
+    downloads_path = Path.home() / "Downloads" / "YT-Downloader"
+    
+    # Crée le dossier s'il n'existe pas
+    create_output_directory(str(downloads_path))
+    
+    return str(downloads_path)
+
+
+def validate_output_path(path: str) -> Tuple[bool, str]:
+    """
+    Valide un chemin de sortie
+    """
+    if not path:
+        return False, "Chemin vide"
+    
+    path_obj = Path(path)
+    
+    # Vérifie si le dossier parent existe ou peut être créé
+    try:
+        path_obj.parent.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        return False, f"Impossible de créer le dossier: {e}"
+    
+    # Vérifie les permissions d'écriture sans créer de fichier réel :
+    # cette validation tourne à chaque modification du champ de chemin
+    if not os.access(str(path_obj.parent), os.W_OK):
+        return False, "Pas de permission d'écriture"
+
+    return True, "Chemin valide"
+
+
+# orjson sérialise 3 à 5 fois plus vite que le json standard ; on s'en sert
+# s'il est installé, sans en faire une dépendance obligatoire
+try:
+    import orjson
+
+    def _settings_loads(data: bytes) -> Dict:
+        return orjson.loads(data)
+
+    def _settings_dumps(settings: Dict) -> bytes:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _settings_loads(data: bytes) -> Dict:
+        return json.loads(data)
+
+    def _settings_dumps(settings: Dict) -> bytes:
+        return json.dumps(settings, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Cache des paramètres déjà lus, invalidé par la date de modification du
+# fichier : load_settings est appelé depuis plusieurs endroits au démarrage
+_SETTINGS_CACHE: Dict[str, Tuple[float, Dict]] = {}
+
+
+def load_settings(settings_file: str = "settings.json") -> Dict:
+    """
+    Charge les paramètres depuis un fichier JSON
+    """
+    default_settings = {
+        'output_path': get_default_download_path(),
+        'default_format': 'mp3',
+        'default_quality': 'medium',
+        'create_subfolders': True,
+        'overwrite_files': False,
+        'max_concurrent_downloads': 3,
+        'theme': 'dark',
+        'language': 'fr',
+    }
+
+    try:
+        settings_path = Path(settings_file)
+        if settings_path.exists():
+            mtime = settings_path.stat().st_mtime
+            cached = _SETTINGS_CACHE.get(settings_file)
+            if cached is not None and cached[0] == mtime:
+                loaded_settings = cached[1]
+            else:
+                loaded_settings = _settings_loads(settings_path.read_bytes())
+                _SETTINGS_CACHE[settings_file] = (mtime, loaded_settings)
+            # Fusionne avec les paramètres par défaut
+            default_settings.update(loaded_settings)
+    except Exception as e:
+        print(f"Erreur lors du chargement des paramètres: {e}")
+
+    return default_settings
+
+
+def save_settings(settings: Dict, settings_file: str = "settings.json") -> bool:
+    """
+    Sauvegarde les paramètres dans un fichier JSON
+    """
+    try:
+        data = _settings_dumps(settings)
+        settings_path = Path(settings_file)
+        # Pas d'écriture (ni d'invalidation du cache) si rien n'a changé
+        if settings_path.exists() and settings_path.read_bytes() == data:
+            return True
+        settings_path.write_bytes(data)
+        _SETTINGS_CACHE[settings_file] = (settings_path.stat().st_mtime, dict(settings))
+        return True
+    except Exception as e:
+        print(f"Erreur lors de la sauvegarde des paramètres: {e}")
+        return False
+
+
+def check_dependencies() -> Dict[str, bool]:
+    """
+    Vérifie que les dépendances nécessaires sont installées
+    """
+    # Pas de fenêtre console furtive sous Windows pour les sous-processus
+    creationflags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+    def _probe(binary: str) -> bool:
+        """Lance `binary -version` et retourne True si l'exécution réussit"""
+        try:
+            # Seul le code de retour nous intéresse : DEVNULL évite de
+            # monter des tuyaux et de décoder une sortie jetée aussitôt
+            subprocess.run([binary, '-version'],
+                          stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL,
+                          check=True, timeout=2,
+                          creationflags=creationflags)
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired,
+                FileNotFoundError):
+            return False
+
+    def _probe_yt_dlp() -> bool:
+        try:
+            import yt_dlp  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    # Les trois sondes bloquent chacune ~50-200 ms sur le lancement du
+    # processus : en parallèle, le démarrage n'en paie qu'une seule.
+    # Clés stables : l'ancien code utilisait le chemin ffmpeg comme clé,
+    # l'appelant ne pouvait donc pas distinguer ffmpeg des autres entrées
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            'yt-dlp': executor.submit(_probe_yt_dlp),
+            'ffmpeg': executor.submit(_probe, get_fmpeg_path()),
+            'ffprobe': executor.submit(_probe, 'ffprobe'),
+        }
+        return {name: future.result() for name, future in futures.items()}
\ No newline at end of file
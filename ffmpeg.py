@@ -1,3 +1,4 @@
+import functools
 import subprocess
 import sys
 import os
@@ -16,6 +17,7 @@ def check_ffmpeg():
         print("ffmpeg n'est pas installé ou pas dans le PATH.")
         return False
 
+@functools.lru_cache(maxsize=1)
 def get_fmpeg_path():
     """Retourne le chemin absolu vers ffmpeg.exe, même dans l'exécutable PyInstaller."""
     if getattr(sys, 'frozen', False):
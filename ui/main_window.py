@@ -1,487 +1,717 @@
-"""
-Fenêtre principale de l'application YouTube Converter
-"""
-
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QLineEdit, QPushButton, QComboBox, 
-                             QProgressBar, QTextEdit, QFileDialog, QListWidget,
-                             QListWidgetItem, QGroupBox, QGridLayout, QSplitter,
-                             QMessageBox, QSpacerItem, QSizePolicy)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QPixmap, QFont
-from core.downloader import YouTubeDownloader
-from core.converter import DownloadWorker
-import os
-import requests
-from urllib.parse import urlparse, parse_qs
-import glob
-import re
-
-def clean_output_folder(output_path):
-    """Supprime les fichiers temporaires du dossier de sortie"""
-    for ext in ('*.part', '*.webm', '*.f*', '*.temp'):
-        for f in glob.glob(os.path.join(output_path, ext)):
-            try:
-                os.remove(f)
-            except Exception:
-                pass
-
-def is_valid_youtube_url(url):
-    """Vérifie si l'URL est une URL YouTube valide"""
-    youtube_regex = re.compile(
-        r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
-    )
-    return youtube_regex.match(url) is not None
-
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.downloader = YouTubeDownloader()
-        self.conversion_workers = []
-        self.url_timer = QTimer()
-        self.url_timer.setSingleShot(True)
-        self.url_timer.timeout.connect(self.fetch_video_info)
-        self.init_ui()
-        self.setup_connections()
-        
-    def init_ui(self):
-        """Initialise l'interface utilisateur"""
-        self.setWindowTitle("YouTube to MP3/MP4 Converter")
-        self.setGeometry(100, 100, 900, 700)
-        
-        # Widget central
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        
-        # Layout principal
-        main_layout = QVBoxLayout(central_widget)
-        
-        # Titre
-        title_label = QLabel("YouTube Converter")
-        title_font = QFont()
-        title_font.setPointSize(18)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        main_layout.addWidget(title_label)
-        
-        # Groupe URL et paramètres
-        input_group = QGroupBox("Téléchargement")
-        input_layout = QGridLayout(input_group)
-        
-        # URL input
-        input_layout.addWidget(QLabel("URL YouTube:"), 0, 0)
-        self.url_input = QLineEdit()
-        self.url_input.setPlaceholderText("Collez l'URL de la vidéo YouTube ici...")
-        input_layout.addWidget(self.url_input, 0, 1, 1, 2)  # Étend sur 2 colonnes
-        
-        # Format selection
-        input_layout.addWidget(QLabel("Format:"), 1, 0)
-        self.format_combo = QComboBox()
-        self.format_combo.addItems(["MP4 (Vidéo)" ,"MP3 (Audio)"])
-        input_layout.addWidget(self.format_combo, 1, 1)
-        
-        # Qualité
-        input_layout.addWidget(QLabel("Qualité:"), 2, 0)
-        self.quality_combo = QComboBox()
-        self.quality_combo.addItems(["Meilleure", "720p", "480p", "360p", "144p"])
-        input_layout.addWidget(self.quality_combo, 2, 1)
-        
-        # Dossier de destination
-        input_layout.addWidget(QLabel("Destination:"), 3, 0)
-        self.output_path = QLineEdit()
-        self.output_path.setText(os.path.expanduser("~/Downloads"))
-        input_layout.addWidget(self.output_path, 3, 1)
-        
-        self.browse_btn = QPushButton("Parcourir")
-        input_layout.addWidget(self.browse_btn, 3, 2)
-        
-        main_layout.addWidget(input_group)
-        
-        # Splitter pour diviser l'interface
-        splitter = QSplitter(Qt.Orientation.Horizontal)
-        
-        # Panel gauche - Informations vidéo
-        left_panel = QWidget()
-        left_layout = QVBoxLayout(left_panel)
-        
-        info_group = QGroupBox("Informations de la vidéo")
-        info_layout = QVBoxLayout(info_group)
-        
-        self.thumbnail_label = QLabel()
-        self.thumbnail_label.setFixedSize(320, 180)
-        self.thumbnail_label.setStyleSheet("border: 1px solid #666666; background-color: #1a1a1a;")
-        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.thumbnail_label.setText("Miniature")
-        info_layout.addWidget(self.thumbnail_label)
-        
-        self.title_label = QLabel("Titre: -")
-        self.title_label.setWordWrap(True)
-        info_layout.addWidget(self.title_label)
-        
-        self.duration_label = QLabel("Durée: -")
-        info_layout.addWidget(self.duration_label)
-        
-        self.views_label = QLabel("Vues: -")
-        info_layout.addWidget(self.views_label)
-        
-        self.author_label = QLabel("Auteur: -")
-        info_layout.addWidget(self.author_label)
-        
-        # Indicateur de chargement
-        self.loading_label = QLabel("Chargement des informations...")
-        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.loading_label.setStyleSheet("color: #0066cc; font-style: italic;")
-        self.loading_label.setVisible(False)
-        info_layout.addWidget(self.loading_label)
-        
-        left_layout.addWidget(info_group)
-        left_layout.addStretch()
-        
-        # Panel droit - Queue et progression
-        right_panel = QWidget()
-        right_layout = QVBoxLayout(right_panel)
-        
-        # Boutons d'action
-        button_layout = QHBoxLayout()
-        self.download_btn = QPushButton("Télécharger")
-        self.download_btn.setEnabled(False)
-        button_layout.addWidget(self.download_btn)
-        
-        self.clear_queue_btn = QPushButton("Vider la queue")
-        button_layout.addWidget(self.clear_queue_btn)
-        
-        right_layout.addLayout(button_layout)
-        
-        # Queue de téléchargement
-        queue_group = QGroupBox("Queue de téléchargement")
-        queue_layout = QVBoxLayout(queue_group)
-        
-        self.download_queue = QListWidget()
-        queue_layout.addWidget(self.download_queue)
-        
-        right_layout.addWidget(queue_group)
-        
-        # Progression globale
-        progress_group = QGroupBox("Progression")
-        progress_layout = QVBoxLayout(progress_group)
-        
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setVisible(False)
-        progress_layout.addWidget(self.progress_bar)
-        
-        self.status_label = QLabel("Prêt")
-        progress_layout.addWidget(self.status_label)
-        
-        right_layout.addWidget(progress_group)
-        
-        # Log
-        log_group = QGroupBox("Journal")
-        log_layout = QVBoxLayout(log_group)
-        
-        self.log_text = QTextEdit()
-        self.log_text.setMaximumHeight(150)
-        self.log_text.setReadOnly(True)
-        log_layout.addWidget(self.log_text)
-        
-        right_layout.addWidget(log_group)
-        
-        # Ajout aux panels
-        splitter.addWidget(left_panel)
-        splitter.addWidget(right_panel)
-        splitter.setSizes([400, 500])
-        
-        main_layout.addWidget(splitter)
-        
-    def setup_connections(self):
-        """Configure les connexions de signaux"""
-        self.download_btn.clicked.connect(self.add_to_queue)
-        self.browse_btn.clicked.connect(self.browse_output_folder)
-        self.clear_queue_btn.clicked.connect(self.clear_queue)
-        self.url_input.returnPressed.connect(self.fetch_video_info)
-        self.url_input.textChanged.connect(self.on_url_changed)
-        self.format_combo.currentTextChanged.connect(self.update_quality_choices)
-        
-    def on_url_changed(self, text):
-        """Appelé quand l'URL change"""
-        # Arrête le timer précédent
-        self.url_timer.stop()
-        
-        # Nettoie l'affichage si l'URL est vide
-        if not text.strip():
-            self.reset_video_info()
-            return
-        
-        # Vérifie si c'est une URL YouTube valide
-        if is_valid_youtube_url(text.strip()):
-            # Démarre un timer pour éviter les appels trop fréquents
-            self.url_timer.start(1000)  # 1 seconde de délai
-        else:
-            self.reset_video_info()
-            
-    def reset_video_info(self):
-        """Remet à zéro les informations vidéo"""
-        self.title_label.setText("Titre: -")
-        self.duration_label.setText("Durée: -")
-        self.views_label.setText("Vues: -")
-        self.author_label.setText("Auteur: -")
-        self.thumbnail_label.clear()
-        self.thumbnail_label.setText("Miniature")
-        self.loading_label.setVisible(False)
-        self.download_btn.setEnabled(False)
-        if hasattr(self, 'video_info'):
-            delattr(self, 'video_info')
-        
-    def fetch_video_info(self):
-        """Récupère les informations de la vidéo"""
-        url = self.url_input.text().strip()
-        if not url:
-            self.log("Veuillez entrer une URL YouTube")
-            return
-            
-        if not is_valid_youtube_url(url):
-            self.log("URL YouTube invalide")
-            return
-            
-        # Affiche l'indicateur de chargement
-        self.loading_label.setVisible(True)
-        self.download_btn.setEnabled(False)
-        self.log(f"Récupération des informations pour: {url}")
-        
-        # Thread pour récupérer les infos
-        self.info_worker = VideoInfoWorker(url)
-        self.info_worker.info_fetched.connect(self.on_info_fetched)
-        self.info_worker.error_occurred.connect(self.on_info_error)
-        self.info_worker.start()
-        
-    def on_info_fetched(self, info):
-        """Traite les informations récupérées"""
-        self.video_info = info
-
-        # Debug : Affiche toutes les qualités disponibles
-        formats = info.get('formats', [])
-        print("---- Qualités disponibles ----")
-        for fmt in formats:
-            vcodec = fmt.get('vcodec', 'none')
-            acodec = fmt.get('acodec', 'none')
-            height = fmt.get('height', 'N/A')
-            ext = fmt.get('ext', 'N/A')
-            abr = fmt.get('abr', 'N/A')
-            format_id = fmt.get('format_id', 'N/A')
-            print(f"ID: {format_id} | {ext} | {height}p | vcodec: {vcodec} | acodec: {acodec} | abr: {abr}kbps")
-        print("-----------------------------")
-
-        # Mise à jour des labels
-        self.title_label.setText(f"Titre: {info.get('title', 'N/A')}")
-        self.duration_label.setText(f"Durée: {self.format_duration(info.get('duration', 0))}")
-        self.views_label.setText(f"Vues: {info.get('view_count', 'N/A'):,}" if info.get('view_count') else "Vues: N/A")
-        self.author_label.setText(f"Auteur: {info.get('uploader', 'N/A')}")
-        
-        # Chargement de la miniature
-        self.load_thumbnail(info.get('thumbnail'))
-        
-        # Mise à jour des choix de qualité
-        quality_choices = self.downloader.get_quality_choices(info['webpage_url'], media_type='mp4')
-        self.quality_combo.clear()
-        for choice in quality_choices:
-            self.quality_combo.addItem(choice['label'], choice['format_id'])
-        
-        self.download_btn.setEnabled(True)
-        self.loading_label.setVisible(False)
-        self.log("Informations récupérées avec succès")
-        
-    def on_info_error(self, error):
-        """Gère les erreurs de récupération d'infos"""
-        self.log(f"Erreur: {error}")
-        self.loading_label.setVisible(False)
-        self.reset_video_info()
-        
-    def load_thumbnail(self, thumbnail_url):
-        """Charge la miniature de la vidéo"""
-        if not thumbnail_url:
-            return
-            
-        try:
-            response = requests.get(thumbnail_url, timeout=10)
-            if response.status_code == 200:
-                pixmap = QPixmap()
-                pixmap.loadFromData(response.content)
-                scaled_pixmap = pixmap.scaled(320, 180, Qt.AspectRatioMode.KeepAspectRatio, 
-                                            Qt.TransformationMode.SmoothTransformation)
-                self.thumbnail_label.setPixmap(scaled_pixmap)
-
-        except Exception as e:
-            self.log(f"Erreur chargement miniature: {e}")
-            
-    def format_duration(self, seconds):
-        """Formate la durée en mm:ss"""
-        if not seconds:
-            return "N/A"
-        mins = seconds // 60
-        secs = seconds % 60
-        return f"{mins:02d}:{secs:02d}"
-        
-    def add_to_queue(self):
-        """Ajoute un téléchargement à la queue"""
-        if not hasattr(self, 'video_info'):
-            self.log("Aucune vidéo sélectionnée")
-            return
-            
-        format_type = "audio" if "MP3" in self.format_combo.currentText() else "video"
-        quality = self.quality_combo.currentText()
-        
-        item_text = f"{self.video_info['title']} - {self.format_combo.currentText()}"
-        item = QListWidgetItem(item_text)
-        item.setData(Qt.ItemDataRole.UserRole, {
-            'info': self.video_info,
-            'format': format_type,
-            'quality': quality,
-            'output_path': self.output_path.text(),
-            'status': 'En attente'
-        })
-        
-        self.download_queue.addItem(item)
-        self.log(f"Ajouté à la queue: {item_text}")
-        
-        if not any(self.download_queue.item(i).data(Qt.ItemDataRole.UserRole)['status'] == 'Téléchargement'
-                for i in range(self.download_queue.count())):
-            self.start_next_download()
-            
-    def start_next_download(self):
-        """Démarre le prochain téléchargement"""
-        if any(w.isRunning() for w in self.conversion_workers):
-            self.log("Un worker tourne déjà, attente…")
-            return
-        for i in range(self.download_queue.count()):
-            item = self.download_queue.item(i)
-            data = item.data(Qt.ItemDataRole.UserRole)
-            if data['status'] == 'En attente':
-                self.log(f"Lancement du téléchargement pour: {data['info']['title']}")
-                self.start_download(item)
-                break
-                
-    def start_download(self, item):
-        """Démarre un téléchargement"""
-        data = item.data(Qt.ItemDataRole.UserRole)
-        data['status'] = 'Téléchargement'
-        
-        # Mise à jour de l'affichage
-        item.setText(f"{data['info']['title']} - {data['status']}")
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-
-        clean_output_folder(data['output_path'])
-        
-        # Worker thread
-        worker = DownloadWorker(
-            data['info']['webpage_url'],
-            data['format'],
-            data['quality'],
-            data['output_path']
-        )
-        
-        # Connexion des signaux - teste les deux noms possibles
-        if hasattr(worker, 'progress_updated'):
-            worker.progress_updated.connect(self.on_progress_updated)
-            self.log("Signal progress_updated connecté")
-        elif hasattr(worker, 'progress'):
-            worker.progress.connect(self.on_progress_updated)
-            # self.log("Signal progress connecté") ## debug
-        else:
-            self.log("ERREUR: Aucun signal de progression trouvé!")
-        
-        worker.finished.connect(lambda: self.on_download_finished(item))
-        worker.error_occurred.connect(lambda error: self.on_download_error(item, error))
-        
-        self.conversion_workers.append(worker)
-        worker.start()
-        
-    def on_progress_updated(self, progress):
-        """Met à jour la barre de progression"""
-        # self.log(f"Progression reçue: {progress}%")  # Debug
-        self.progress_bar.setValue(int(progress))
-        self.status_label.setText(f"Téléchargement en cours... {progress:.1f}%")
-        
-    def on_download_finished(self, item):
-        """Téléchargement terminé"""
-        self.log("Téléchargement terminé, appel de on_download_finished")
-        data = item.data(Qt.ItemDataRole.UserRole)
-        data['status'] = 'Terminé'
-        item.setData(Qt.ItemDataRole.UserRole, data)
-        item.setText(f"{data['info']['title']} - ✓ Terminé")
-        self.log(f"Téléchargement terminé: {data['info']['title']}")
-        self.cleanup_finished_workers()
-        self.start_next_download()
-        
-        # Cacher la barre si fini
-        if not any(self.download_queue.item(i).data(Qt.ItemDataRole.UserRole)['status'] == 'Téléchargement' 
-                  for i in range(self.download_queue.count())):
-            self.progress_bar.setVisible(False)
-            self.status_label.setText("Prêt")
-            
-    def on_download_error(self, item, error):
-        """Erreur de téléchargement"""
-        data = item.data(Qt.ItemDataRole.UserRole)
-        data['status'] = 'Erreur'
-        item.setData(Qt.ItemDataRole, data)
-        item.setText(f"{data['info']['title']} - ✗ Erreur")
-        self.log(f"Erreur téléchargement: {error}")
-        self.cleanup_finished_workers()
-        self.start_next_download()
-        
-    def cleanup_finished_workers(self):
-        """Nettoie les workers terminés"""
-        self.conversion_workers = [w for w in self.conversion_workers if w.isRunning()]
-        
-    def browse_output_folder(self):
-        """Sélectionne le dossier de destination"""
-        folder = QFileDialog.getExistingDirectory(self, "Sélectionner le dossier de destination")
-        if folder:
-            self.output_path.setText(folder)
-            
-    def clear_queue(self):
-        """Vide la queue de téléchargement"""
-        self.download_queue.clear()
-        self.log("Queue vidée")
-        
-    def log(self, message):
-        """Ajoute un message au journal"""
-        self.log_text.append(f"[{self.get_timestamp()}] {message}")
-        
-    def get_timestamp(self):
-        """Retourne l'horodatage actuel"""
-        from datetime import datetime
-        return datetime.now().strftime("%H:%M:%S")
-
-    def update_quality_choices(self):
-        """Met à jour la liste des qualités selon le format choisi"""
-        if not hasattr(self, 'video_info'):
-            return
-        format_type = "audio" if "MP3" in self.format_combo.currentText() else "video"
-        # Appelle la bonne méthode du downloader
-        if format_type == "audio":
-            choices = self.downloader.get_quality_choices(self.video_info['webpage_url'], media_type='mp3')
-        else:
-            choices = self.downloader.get_quality_choices(self.video_info['webpage_url'], media_type='mp4')
-        self.quality_combo.clear()
-        for choice in choices:
-            self.quality_combo.addItem(choice['label'], choice['format_id'])
-
-class VideoInfoWorker(QThread):
-    """Worker thread pour récupérer les infos vidéo"""
-    info_fetched = pyqtSignal(dict)
-    error_occurred = pyqtSignal(str)
-    
-    def __init__(self, url):
-        super().__init__()
-        self.url = url
-        
-    def run(self):
-        try:
-            from core.downloader import YouTubeDownloader
-            downloader = YouTubeDownloader()
-            info = downloader.get_video_info(self.url)
-            self.info_fetched.emit(info)
-        except Exception as e:
-            self.error_occurred.emit(str(e))
\ No newline at end of file
+"""
+Fenêtre principale de l'application YouTube Converter
+"""
+
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                             QLabel, QLineEdit, QPushButton, QComboBox, 
+                             QProgressBar, QTextEdit, QFileDialog, QListWidget,
+                             QListWidgetItem, QGroupBox, QGridLayout, QSplitter,
+                             QMessageBox, QSpacerItem, QSizePolicy)
+from PyQt6.QtCore import Qt, QThread, QThreadPool, QRunnable, pyqtSignal, QTimer, QUrl
+from PyQt6.QtGui import QImage, QPixmap, QFont
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+from core.downloader import YouTubeDownloader
+from core.converter import DownloadWorker
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import re
+
+# Fragments intermédiaires de yt-dlp (titre.f137.mp4, titre.f140.m4a...)
+_FRAGMENT_RE = re.compile(r'.*\.f\d+')
+
+# Suffixes des fichiers temporaires balayés avant chaque téléchargement
+_JUNK_SUFFIXES = ('.part', '.webm', '.temp')
+
+# Au-delà de cet âge, un fichier temporaire vient probablement d'un autre
+# outil ou d'une autre session : on n'y touche pas
+_JUNK_MAX_AGE = 24 * 3600  # secondes
+
+def clean_output_folder(output_path):
+    """Supprime les fichiers temporaires récents du dossier de sortie"""
+    if not os.path.isdir(output_path):
+        return
+    # Un seul parcours du dossier au lieu de quatre passes glob : pour un
+    # dossier Téléchargements bien rempli, c'est quatre fois moins de
+    # lectures de répertoire et aucun fnmatch en Python
+    cutoff = time.time() - _JUNK_MAX_AGE
+    try:
+        with os.scandir(output_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(_JUNK_SUFFIXES) or _FRAGMENT_RE.match(name):
+                    try:
+                        if entry.stat().st_mtime >= cutoff:
+                            os.unlink(entry.path)
+                    except OSError:
+                        pass
+    except OSError:
+        pass
+
+# Compilée une seule fois au chargement : la validation tourne à chaque
+# frappe dans le champ URL via textChanged
+_YT_URL_RE = re.compile(
+    r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
+    r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
+)
+
+
+def is_valid_youtube_url(url):
+    """Vérifie si l'URL est une URL YouTube valide"""
+    return _YT_URL_RE.match(url) is not None
+
+class MainWindow(QMainWindow):
+    # Émis depuis le pool de threads quand la version lissée d'une miniature
+    # est prête (connexion en file : le slot tourne côté interface)
+    smooth_thumb_ready = pyqtSignal(str, QImage)
+
+    def __init__(self):
+        super().__init__()
+        self.downloader = YouTubeDownloader()
+        self.conversion_workers = []
+        # File FIFO des éléments en attente + compteur des actifs : les
+        # transitions de la queue restent en O(1) au lieu de re-balayer
+        # tous les items (et désérialiser leur dict) à chaque événement
+        self._pending = deque()
+        self._active_count = 0
+        self._max_parallel = 3
+        # Charges utiles des items de la queue, possédées côté Python : les
+        # items ne stockent qu'un id, ce qui épargne la conversion
+        # dict <-> QVariant à chaque lecture ou transition d'état
+        self._jobs = {}
+        self._next_job_id = 0
+        self._last_pct = -1
+        # Gestionnaire réseau Qt pour les miniatures : keep-alive (et HTTP/2)
+        # natifs, complétion asynchrone dans la boucle d'événements — aucun
+        # thread à faire tourner ; caches ETag (octets) et QPixmap décodées
+        self._nam = QNetworkAccessManager(self)
+        self._nam.setTransferTimeout(10000)
+        self._thumb_cache = {}
+        self._pixmap_cache = {}
+        self.url_timer = QTimer()
+        self.url_timer.setSingleShot(True)
+        self.url_timer.timeout.connect(self.fetch_video_info)
+        # Journal tamponné : pendant un téléchargement, les workers peuvent
+        # loguer des dizaines de fois par seconde, et chaque append de
+        # QTextEdit redessine le widget ; on vide le tampon toutes les 100 ms
+        self._log_buf = []
+        self._log_timer = QTimer()
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
+        self.init_ui()
+        self.setup_connections()
+        
+    def init_ui(self):
+        """Initialise l'interface utilisateur"""
+        self.setWindowTitle("YouTube to MP3/MP4 Converter")
+        self.setGeometry(100, 100, 900, 700)
+        
+        # Widget central
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        # Layout principal
+        main_layout = QVBoxLayout(central_widget)
+        
+        # Titre
+        title_label = QLabel("YouTube Converter")
+        title_font = QFont()
+        title_font.setPointSize(18)
+        title_font.setBold(True)
+        title_label.setFont(title_font)
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        main_layout.addWidget(title_label)
+        
+        # Groupe URL et paramètres
+        input_group = QGroupBox("Téléchargement")
+        input_layout = QGridLayout(input_group)
+        
+        # URL input
+        input_layout.addWidget(QLabel("URL YouTube:"), 0, 0)
+        self.url_input = QLineEdit()
+        self.url_input.setPlaceholderText("Collez l'URL de la vidéo YouTube ici...")
+        input_layout.addWidget(self.url_input, 0, 1, 1, 2)  # Étend sur 2 colonnes
+        
+        # Format selection
+        input_layout.addWidget(QLabel("Format:"), 1, 0)
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(["MP4 (Vidéo)" ,"MP3 (Audio)"])
+        input_layout.addWidget(self.format_combo, 1, 1)
+        
+        # Qualité
+        input_layout.addWidget(QLabel("Qualité:"), 2, 0)
+        self.quality_combo = QComboBox()
+        self.quality_combo.addItems(["Meilleure", "720p", "480p", "360p", "144p"])
+        input_layout.addWidget(self.quality_combo, 2, 1)
+        
+        # Dossier de destination
+        input_layout.addWidget(QLabel("Destination:"), 3, 0)
+        self.output_path = QLineEdit()
+        self.output_path.setText(os.path.expanduser("~/Downloads"))
+        input_layout.addWidget(self.output_path, 3, 1)
+        
+        self.browse_btn = QPushButton("Parcourir")
+        input_layout.addWidget(self.browse_btn, 3, 2)
+        
+        main_layout.addWidget(input_group)
+        
+        # Splitter pour diviser l'interface
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        # Panel gauche - Informations vidéo
+        left_panel = QWidget()
+        left_layout = QVBoxLayout(left_panel)
+        
+        info_group = QGroupBox("Informations de la vidéo")
+        info_layout = QVBoxLayout(info_group)
+        
+        self.thumbnail_label = QLabel()
+        self.thumbnail_label.setFixedSize(320, 180)
+        self.thumbnail_label.setStyleSheet("border: 1px solid #666666; background-color: #1a1a1a;")
+        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.thumbnail_label.setText("Miniature")
+        info_layout.addWidget(self.thumbnail_label)
+        
+        self.title_label = QLabel("Titre: -")
+        self.title_label.setWordWrap(True)
+        info_layout.addWidget(self.title_label)
+        
+        self.duration_label = QLabel("Durée: -")
+        info_layout.addWidget(self.duration_label)
+        
+        self.views_label = QLabel("Vues: -")
+        info_layout.addWidget(self.views_label)
+        
+        self.author_label = QLabel("Auteur: -")
+        info_layout.addWidget(self.author_label)
+        
+        # Indicateur de chargement
+        self.loading_label = QLabel("Chargement des informations...")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setStyleSheet("color: #0066cc; font-style: italic;")
+        self.loading_label.setVisible(False)
+        info_layout.addWidget(self.loading_label)
+        
+        left_layout.addWidget(info_group)
+        left_layout.addStretch()
+        
+        # Panel droit - Queue et progression
+        right_panel = QWidget()
+        right_layout = QVBoxLayout(right_panel)
+        
+        # Boutons d'action
+        button_layout = QHBoxLayout()
+        self.download_btn = QPushButton("Télécharger")
+        self.download_btn.setEnabled(False)
+        button_layout.addWidget(self.download_btn)
+        
+        self.clear_queue_btn = QPushButton("Vider la queue")
+        button_layout.addWidget(self.clear_queue_btn)
+        
+        right_layout.addLayout(button_layout)
+        
+        # Queue de téléchargement
+        queue_group = QGroupBox("Queue de téléchargement")
+        queue_layout = QVBoxLayout(queue_group)
+        
+        self.download_queue = QListWidget()
+        queue_layout.addWidget(self.download_queue)
+        
+        right_layout.addWidget(queue_group)
+        
+        # Progression globale
+        progress_group = QGroupBox("Progression")
+        progress_layout = QVBoxLayout(progress_group)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel("Prêt")
+        progress_layout.addWidget(self.status_label)
+        
+        right_layout.addWidget(progress_group)
+        
+        # Log
+        log_group = QGroupBox("Journal")
+        log_layout = QVBoxLayout(log_group)
+        
+        self.log_text = QTextEdit()
+        self.log_text.setMaximumHeight(150)
+        self.log_text.setReadOnly(True)
+        log_layout.addWidget(self.log_text)
+        
+        right_layout.addWidget(log_group)
+        
+        # Ajout aux panels
+        splitter.addWidget(left_panel)
+        splitter.addWidget(right_panel)
+        splitter.setSizes([400, 500])
+        
+        main_layout.addWidget(splitter)
+        
+    def setup_connections(self):
+        """Configure les connexions de signaux"""
+        self.download_btn.clicked.connect(self.add_to_queue)
+        self.browse_btn.clicked.connect(self.browse_output_folder)
+        self.clear_queue_btn.clicked.connect(self.clear_queue)
+        self.url_input.returnPressed.connect(self.fetch_video_info)
+        self.url_input.textChanged.connect(self.on_url_changed)
+        self.format_combo.currentTextChanged.connect(self.update_quality_choices)
+        self.smooth_thumb_ready.connect(self._on_smooth_thumb)
+        
+    def on_url_changed(self, text):
+        """Appelé quand l'URL change"""
+        # Arrête le timer précédent
+        self.url_timer.stop()
+        
+        # Nettoie l'affichage si l'URL est vide
+        if not text.strip():
+            self.reset_video_info()
+            return
+        
+        # Pré-filtre à bas coût : pendant la frappe manuelle, la plupart des
+        # textes intermédiaires ne contiennent même pas "youtu", inutile de
+        # solliciter le moteur de regex pour les écarter
+        if "youtu" not in text:
+            self.reset_video_info()
+            return
+
+        # Vérifie si c'est une URL YouTube valide
+        if is_valid_youtube_url(text.strip()):
+            # Démarre un timer pour éviter les appels trop fréquents
+            self.url_timer.start(1000)  # 1 seconde de délai
+        else:
+            self.reset_video_info()
+            
+    def reset_video_info(self):
+        """Remet à zéro les informations vidéo"""
+        self.title_label.setText("Titre: -")
+        self.duration_label.setText("Durée: -")
+        self.views_label.setText("Vues: -")
+        self.author_label.setText("Auteur: -")
+        self.thumbnail_label.clear()
+        self.thumbnail_label.setText("Miniature")
+        self.loading_label.setVisible(False)
+        self.download_btn.setEnabled(False)
+        self._last_fetched_url = None
+        self._quality_cache = None
+        if hasattr(self, 'video_info'):
+            delattr(self, 'video_info')
+        
+    def fetch_video_info(self):
+        """Récupère les informations de la vidéo"""
+        url = self.url_input.text().strip()
+        if not url:
+            self.log("Veuillez entrer une URL YouTube")
+            return
+            
+        if not is_valid_youtube_url(url):
+            self.log("URL YouTube invalide")
+            return
+
+        # Même URL que la dernière extraction réussie : inutile de relancer
+        # yt-dlp et la miniature, tout est déjà affiché
+        if getattr(self, '_last_fetched_url', None) == url and hasattr(self, 'video_info'):
+            self.download_btn.setEnabled(True)
+            return
+
+        # Affiche l'indicateur de chargement
+        self.loading_label.setVisible(True)
+        self.download_btn.setEnabled(False)
+        self.log(f"Récupération des informations pour: {url}")
+        
+        # Invalide le worker précédent encore en vol : son extract_info ne
+        # peut pas être interrompu, mais son résultat périmé sera ignoré
+        self._info_req_id = getattr(self, '_info_req_id', 0) + 1
+        previous = getattr(self, 'info_worker', None)
+        if previous is not None and previous.isRunning():
+            previous.requestInterruption()
+
+        # Thread pour récupérer les infos ; la miniature part ensuite sur le
+        # QNetworkAccessManager, asynchrone dans la boucle Qt. Le downloader
+        # de la fenêtre est partagé : son instance YoutubeDL (extracteurs,
+        # cookiejar) et son cache d'extractions servent à toutes les requêtes
+        self.info_worker = VideoInfoWorker(url, self._info_req_id,
+                                           self.downloader)
+        self.info_worker.info_fetched.connect(self.on_info_fetched)
+        self.info_worker.error_occurred.connect(self.on_info_error)
+        self.info_worker.start()
+        
+    def on_info_fetched(self, req_id, info):
+        """Traite les informations récupérées"""
+        # Résultat d'une requête dépassée par une plus récente : on l'ignore
+        if req_id != getattr(self, '_info_req_id', 0):
+            return
+        self.video_info = info
+        self._last_fetched_url = info.get('webpage_url')
+
+        # Debug : Affiche toutes les qualités disponibles
+        formats = info.get('formats', [])
+        print("---- Qualités disponibles ----")
+        for fmt in formats:
+            vcodec = fmt.get('vcodec', 'none')
+            acodec = fmt.get('acodec', 'none')
+            height = fmt.get('height', 'N/A')
+            ext = fmt.get('ext', 'N/A')
+            abr = fmt.get('abr', 'N/A')
+            format_id = fmt.get('format_id', 'N/A')
+            print(f"ID: {format_id} | {ext} | {height}p | vcodec: {vcodec} | acodec: {acodec} | abr: {abr}kbps")
+        print("-----------------------------")
+
+        # Mise à jour des labels
+        self.title_label.setText(f"Titre: {info.get('title', 'N/A')}")
+        self.duration_label.setText(f"Durée: {self.format_duration(info.get('duration', 0))}")
+        # view_count peut être absent ou non numérique (flux en direct) :
+        # le format ,:d planterait sur autre chose qu'un entier
+        view_count = info.get('view_count')
+        self.views_label.setText(
+            f"Vues: {view_count:,}" if isinstance(view_count, int) else "Vues: N/A")
+        self.author_label.setText(f"Auteur: {info.get('uploader', 'N/A')}")
+        
+        # Chargement de la miniature
+        self.load_thumbnail(info.get('thumbnail'))
+        
+        # Choix de qualité calculés une fois pour les deux formats depuis
+        # l'extraction déjà en main : basculer MP3/MP4 ne recontacte plus
+        # yt-dlp, on repeuple la combo depuis ce cache
+        self._quality_cache = {
+            media: self.downloader.get_quality_choices(
+                info['webpage_url'], media_type=media, info=info)
+            for media in ('mp3', 'mp4')
+        }
+        self.update_quality_choices()
+        
+        self.download_btn.setEnabled(True)
+        self.loading_label.setVisible(False)
+        self.log("Informations récupérées avec succès")
+        
+    def on_info_error(self, req_id, error):
+        """Gère les erreurs de récupération d'infos"""
+        if req_id != getattr(self, '_info_req_id', 0):
+            return
+        self.log(f"Erreur: {error}")
+        self.loading_label.setVisible(False)
+        self.reset_video_info()
+        
+    def load_thumbnail(self, thumbnail_url):
+        """Charge la miniature via le gestionnaire réseau Qt"""
+        if not thumbnail_url:
+            return
+
+        # Pixmap déjà décodée et redimensionnée : affichage immédiat
+        cached_pixmap = self._pixmap_cache.get(thumbnail_url)
+        if cached_pixmap is not None:
+            self.thumbnail_label.setPixmap(cached_pixmap)
+            return
+
+        request = QNetworkRequest(QUrl(thumbnail_url))
+        cached = self._thumb_cache.get(thumbnail_url)
+        if cached and cached[0]:
+            # Revalidation conditionnelle : un 304 évite de retélécharger
+            # des octets identiques
+            request.setRawHeader(b'If-None-Match', cached[0].encode('latin-1'))
+        reply = self._nam.get(request)
+        reply.finished.connect(lambda: self._on_thumb_reply(reply, thumbnail_url))
+
+    def _on_thumb_reply(self, reply, thumbnail_url):
+        """Traite la réponse réseau d'une miniature"""
+        try:
+            status = reply.attribute(
+                QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+            cached = self._thumb_cache.get(thumbnail_url)
+            if status == 304 and cached:
+                self._apply_thumbnail(thumbnail_url, cached[0], cached[1])
+            elif status == 200:
+                etag = bytes(reply.rawHeader(b'ETag')).decode('latin-1') or None
+                self._apply_thumbnail(thumbnail_url, etag, bytes(reply.readAll()))
+            elif reply.error() != reply.NetworkError.NoError:
+                self.log(f"Erreur chargement miniature: {reply.errorString()}")
+        finally:
+            reply.deleteLater()
+
+    # Bornes des caches miniature : au-delà, on évince les entrées les plus
+    # anciennes (les dict Python conservent l'ordre d'insertion)
+    _THUMB_CACHE_MAX = 32
+
+    def _apply_thumbnail(self, thumbnail_url, etag, data):
+        """Décode et affiche une miniature reçue du réseau"""
+        self._thumb_cache[thumbnail_url] = (etag, data)
+        # Indice de format : les miniatures YouTube sont des JPEG, Qt n'a
+        # pas besoin d'essayer tous ses plugins d'image pour le deviner
+        image = QImage.fromData(data, "JPG")
+        if image.isNull():
+            # yt-dlp renvoie parfois une URL WebP (i.ytimg.com/vi_webp/...) :
+            # on laisse alors Qt détecter le format lui-même
+            image = QImage.fromData(data)
+        # Affichage immédiat en interpolation rapide : l'utilisateur voit la
+        # miniature dès la frame suivante, la version lissée (bilinéaire sur
+        # l'image entière) est calculée hors du thread d'interface
+        fast = QPixmap.fromImage(image.scaled(
+            320, 180, Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.FastTransformation))
+        if getattr(self, 'video_info', {}).get('thumbnail') == thumbnail_url:
+            self.thumbnail_label.setPixmap(fast)
+        QThreadPool.globalInstance().start(
+            _SmoothScaleTask(self, thumbnail_url, image))
+
+    def _on_smooth_thumb(self, thumbnail_url, image):
+        """Reçoit la miniature lissée et remplace la version rapide"""
+        scaled_pixmap = QPixmap.fromImage(image)
+        self._pixmap_cache[thumbnail_url] = scaled_pixmap
+        for cache in (self._thumb_cache, self._pixmap_cache):
+            while len(cache) > self._THUMB_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+        # N'affiche que si la vidéo courante attend toujours cette miniature
+        if getattr(self, 'video_info', {}).get('thumbnail') == thumbnail_url:
+            self.thumbnail_label.setPixmap(scaled_pixmap)
+            
+    @staticmethod
+    def format_duration(seconds):
+        """Formate la durée en mm:ss"""
+        if not seconds:
+            return "N/A"
+        mins, secs = divmod(int(seconds), 60)
+        return f"{mins:02d}:{secs:02d}"
+        
+    def add_to_queue(self):
+        """Ajoute un téléchargement à la queue"""
+        if not hasattr(self, 'video_info'):
+            self.log("Aucune vidéo sélectionnée")
+            return
+            
+        format_type = "audio" if "MP3" in self.format_combo.currentText() else "video"
+        quality = self.quality_combo.currentText()
+        
+        item_text = f"{self.video_info['title']} - {self.format_combo.currentText()}"
+        item = QListWidgetItem(item_text)
+        self._next_job_id += 1
+        item.setData(Qt.ItemDataRole.UserRole, self._next_job_id)
+        self._jobs[self._next_job_id] = {
+            'info': self.video_info,
+            'format': format_type,
+            'quality': quality,
+            'output_path': self.output_path.text(),
+            'status': 'En attente'
+        }
+        
+        self.download_queue.addItem(item)
+        self._pending.append(item)
+        self.log(f"Ajouté à la queue: {item_text}")
+        
+        self._dispatch()
+            
+    def _dispatch(self):
+        """Lance des téléchargements tant que la limite n'est pas atteinte.
+
+        Les vidéos ne partagent aucun état : en faire tourner quelques-unes
+        en parallèle recouvre les phases réseau et remux ffmpeg, au lieu de
+        sérialiser toute la queue derrière un seul worker.
+        """
+        while self._active_count < self._max_parallel and self._pending:
+            item = self._pending.popleft()
+            data = self._jobs[item.data(Qt.ItemDataRole.UserRole)]
+            self.log(f"Lancement du téléchargement pour: {data['info']['title']}")
+            self.start_download(item)
+                
+    def start_download(self, item):
+        """Démarre un téléchargement"""
+        job_id = item.data(Qt.ItemDataRole.UserRole)
+        data = self._jobs[job_id]
+        data['status'] = 'Téléchargement'
+        data['progress'] = 0
+
+        # Mise à jour de l'affichage
+        item.setText(f"{data['info']['title']} - {data['status']}")
+        if self._active_count == 0:
+            # On ne remet le throttle à zéro qu'au repos : les autres
+            # workers sont peut-être en plein vol
+            self._last_pct = -1
+            self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+
+        # Ne balaye le dossier qu'au repos : avec plusieurs workers en
+        # parallèle, les .part/.fNNN récents appartiennent aux autres
+        # téléchargements en cours et les supprimer casserait leur rename final
+        if self._active_count == 0:
+            clean_output_folder(data['output_path'])
+        
+        # Worker thread
+        worker = DownloadWorker(
+            data['info']['webpage_url'],
+            data['format'],
+            data['quality'],
+            data['output_path']
+        )
+        
+        # Connexion des signaux - teste les deux noms possibles
+        if hasattr(worker, 'progress_updated'):
+            worker.progress_updated.connect(
+                lambda progress, j=job_id: self.on_progress_updated(j, progress))
+            self.log("Signal progress_updated connecté")
+        elif hasattr(worker, 'progress'):
+            worker.progress.connect(
+                lambda progress, j=job_id: self.on_progress_updated(j, progress))
+            # self.log("Signal progress connecté") ## debug
+        else:
+            self.log("ERREUR: Aucun signal de progression trouvé!")
+        
+        worker.finished.connect(lambda: self.on_download_finished(item))
+        worker.error_occurred.connect(lambda error: self.on_download_error(item, error))
+        
+        self.conversion_workers.append(worker)
+        self._active_count += 1
+        worker.start()
+        
+    def on_progress_updated(self, job_id, progress):
+        """Met à jour la barre de progression"""
+        job = self._jobs.get(job_id)
+        if job is None or job['status'] != 'Téléchargement':
+            return
+        job['progress'] = progress
+
+        # Avec plusieurs workers, la barre affiche la moyenne des
+        # téléchargements en cours plutôt que le dernier signal arrivé
+        active = [d['progress'] for d in self._jobs.values()
+                  if d['status'] == 'Téléchargement']
+        # Le signal peut arriver des centaines de fois par seconde : on ne
+        # touche aux widgets que quand le pourcentage entier change
+        pct = int(sum(active) / len(active))
+        if pct == self._last_pct:
+            return
+        self._last_pct = pct
+        self.progress_bar.setValue(pct)
+        if len(active) > 1:
+            self.status_label.setText(
+                f"Téléchargement en cours... {pct}% ({len(active)} en parallèle)")
+        else:
+            self.status_label.setText(f"Téléchargement en cours... {pct}%")
+        
+    def on_download_finished(self, item):
+        """Téléchargement terminé"""
+        self.log("Téléchargement terminé, appel de on_download_finished")
+        data = self._jobs[item.data(Qt.ItemDataRole.UserRole)]
+        data['status'] = 'Terminé'
+        item.setText(f"{data['info']['title']} - ✓ Terminé")
+        self.log(f"Téléchargement terminé: {data['info']['title']}")
+        self._active_count = max(0, self._active_count - 1)
+        self.cleanup_finished_workers()
+        self._dispatch()
+        
+        # Cacher la barre si fini
+        if self._active_count == 0:
+            self._last_pct = -1
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("Prêt")
+            
+    def on_download_error(self, item, error):
+        """Erreur de téléchargement"""
+        data = self._jobs[item.data(Qt.ItemDataRole.UserRole)]
+        data['status'] = 'Erreur'
+        item.setText(f"{data['info']['title']} - ✗ Erreur")
+        self.log(f"Erreur téléchargement: {error}")
+        self._active_count = max(0, self._active_count - 1)
+        self.cleanup_finished_workers()
+        self._dispatch()
+        
+    def cleanup_finished_workers(self):
+        """Nettoie les workers terminés"""
+        self.conversion_workers = [w for w in self.conversion_workers if w.isRunning()]
+        
+    def browse_output_folder(self):
+        """Sélectionne le dossier de destination"""
+        folder = QFileDialog.getExistingDirectory(self, "Sélectionner le dossier de destination")
+        if folder:
+            self.output_path.setText(folder)
+            
+    def clear_queue(self):
+        """Vide la queue de téléchargement"""
+        self._pending.clear()
+        self._jobs.clear()
+        self.download_queue.clear()
+        self.log("Queue vidée")
+        
+    def log(self, message):
+        """Ajoute un message au journal (affiché au prochain flush)"""
+        self._log_buf.append(f"[{self.get_timestamp()}] {message}")
+
+    def _flush_log(self):
+        """Insère les messages en attente en un seul append"""
+        if self._log_buf:
+            self.log_text.append("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def get_timestamp(self):
+        """Retourne l'horodatage actuel"""
+        return datetime.now().strftime("%H:%M:%S")
+
+    def update_quality_choices(self):
+        """Met à jour la liste des qualités selon le format choisi"""
+        if not hasattr(self, 'video_info') or not getattr(self, '_quality_cache', None):
+            return
+        media_type = "mp3" if "MP3" in self.format_combo.currentText() else "mp4"
+        choices = self._quality_cache.get(media_type, [])
+        # Signaux bloqués pendant le repeuplement : clear() + N addItem()
+        # émettraient sinon autant de currentIndexChanged et d'invalidations
+        # de layout que d'entrées
+        self.quality_combo.blockSignals(True)
+        self.quality_combo.clear()
+        for choice in choices:
+            self.quality_combo.addItem(choice['label'], choice['format_id'])
+        self.quality_combo.blockSignals(False)
+        if choices:
+            self.quality_combo.setCurrentIndex(0)
+
+class _SmoothScaleTask(QRunnable):
+    """Calcule la version lissée d'une miniature hors du thread Qt.
+
+    QImage (contrairement à QPixmap) se manipule sans danger hors du thread
+    d'interface ; le résultat revient par signal, donc en file d'attente.
+    """
+
+    def __init__(self, window, url, image):
+        super().__init__()
+        self.window = window
+        self.url = url
+        self.image = image
+
+    def run(self):
+        scaled = self.image.scaled(
+            320, 180, Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation)
+        self.window.smooth_thumb_ready.emit(self.url, scaled)
+
+
+class VideoInfoWorker(QThread):
+    """Worker thread pour récupérer les infos vidéo"""
+    info_fetched = pyqtSignal(int, dict)
+    error_occurred = pyqtSignal(int, str)
+
+    # Un seul thread à la fois dans l'extracteur partagé : YoutubeDL ne
+    # garantit pas la réentrance, et sérialiser reste bien moins cher que
+    # reconstruire l'instance (et réenregistrer les extracteurs) par requête
+    _downloader_lock = threading.Lock()
+    
+    def __init__(self, url, req_id=0, downloader=None):
+        super().__init__()
+        self.url = url
+        self.req_id = req_id
+        self.downloader = downloader
+        
+    def run(self):
+        try:
+            downloader = self.downloader
+            if downloader is None:
+                from core.downloader import YouTubeDownloader
+                downloader = YouTubeDownloader()
+            with self._downloader_lock:
+                info = downloader.get_video_info(self.url)
+            if self.isInterruptionRequested():
+                return
+            self.info_fetched.emit(self.req_id, info)
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.error_occurred.emit(self.req_id, str(e))
\ No newline at end of file